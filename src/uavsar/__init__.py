@@ -1,2 +1,11 @@
 """A package to search, download, and process UAVSAR data from ASF."""
-from .core import UavsarDownloader
\ No newline at end of file
+
+__all__ = ["UavsarDownloader"]
+
+
+def __getattr__(name):
+    # Loaded on first access, so importing the CLI doesn't pull in rasterio and asf_search.
+    if name == "UavsarDownloader":
+        from .core import UavsarDownloader
+        return UavsarDownloader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,58 @@
 import typer
-import questionary
-from questionary import Separator
+import functools
 import logging
+import logging.handlers
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from .core import UavsarDownloader
+if TYPE_CHECKING:
+    from .core import UavsarDownloader
+
+# Heavy modules (questionary, and rasterio/asf_search through .core) are imported inside
+# each command, so `uavsar --help` and shell completion don't pay for them.
 
 app = typer.Typer()
 
+# Processing levels offered by `search`, keyed by the description shown in the prompt.
+PROCESSING_LEVELS = {
+    # Geocoded Data (best for current GeoTIFF conversion)
+    "GRD_HD (High-Resolution Geocoded)": "GRD_HD",
+    "GRD_MD (Medium-Resolution Geocoded)": "GRD_MD",
+    "AMPLITUDE_GRD (Amplitude Geocoded)": "AMPLITUDE_GRD",
+    "INTERFEROMETRY_GRD (Interferometry Geocoded)": "INTERFEROMETRY_GRD",
+
+    # Slant Range Data
+    "COMPLEX (Complex Slant Range)": "COMPLEX",
+    "AMPLITUDE (Amplitude Slant Range)": "AMPLITUDE",
+    "INTERFEROMETRY (Interferometry Slant Range)": "INTERFEROMETRY",
+
+    # Projected Data
+    "PROJECTED (Projected)": "PROJECTED",
+    "PROJECTED_ML3X3 (Projected, 3x3 Multi-looked)": "PROJECTED_ML3X3",
+    "PROJECTED_ML5X5 (Projected, 5x5 Multi-looked)": "PROJECTED_ML5X5",
+
+    # Auxiliary Products
+    "INC (Incidence Angle Map)": "INC",
+    "SLOPE (Slope Map)": "SLOPE",
+    "DEM_TIFF (Digital Elevation Model GeoTIFF)": "DEM_TIFF",
+    "PAULI (Pauli Decomposition)": "PAULI",
+}
+
+@dataclass
+class SearchParams:
+    """The campaign, processing levels and date range of a search. Missing values are prompted for."""
+    campaign: str | None = None
+    levels: list[str] | None = None
+    start_date: str | None = None
+    end_date: str | None = None
+
 def is_valid_date(date_string):
     """Validator for questionary to ensure date is in YYYY-MM-DD format."""
     try:
@@ -17,16 +61,108 @@ def is_valid_date(date_string):
     except ValueError:
         return "Please enter a date in YYYY-MM-DD format."
 
-def _select_data_directory(campaign_path: Path, file_glob: str, prompt_message: str) -> list[Path]:
-    """Helper to interactively select data subdirectories within a campaign."""
-    potential_dirs = []
-    product_dirs = sorted([d for d in campaign_path.iterdir() if d.is_dir()])
+def _check_date(value: str | None) -> str | None:
+    """Typer callback that rejects dates not in YYYY-MM-DD format."""
+    if value is not None and is_valid_date(value) is not True:
+        raise typer.BadParameter("Please enter a date in YYYY-MM-DD format.")
+    return value
+
+def _check_levels(values: list[str] | None) -> list[str] | None:
+    """Typer callback that rejects unknown processing levels."""
+    unknown = [v for v in values or [] if v not in PROCESSING_LEVELS.values()]
+    if unknown:
+        raise typer.BadParameter(
+            f"Unknown processing level(s): {', '.join(unknown)}. "
+            f"Choose from: {', '.join(PROCESSING_LEVELS.values())}."
+        )
+    return values or None
+
+def _in_background(fn, *args) -> Future:
+    """
+    Starts `fn(*args)` on a daemon thread and returns a Future for its result.
+
+    Used to overlap slow lookups with the user answering prompts. The thread is a daemon
+    so that cancelling the CLI doesn't wait for a lookup that is no longer needed.
+    """
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+@contextmanager
+def _held_logs():
+    """
+    Holds back log records while a prompt is on screen and emits them once it closes.
+
+    Lookups started with `_in_background` log while questionary is drawing its prompt,
+    which would otherwise garble it.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers
+    buffer = logging.handlers.BufferingHandler(capacity=sys.maxsize)
+    root.handlers = [buffer]
+    try:
+        yield
+    finally:
+        root.handlers = handlers
+        for record in buffer.buffer:
+            root.handle(record)
+
+@functools.lru_cache(maxsize=64)
+def _scan_subdirs(path_str: str, mtime: float) -> tuple[Path, ...]:
+    """
+    Lists the non-hidden subdirectories of a directory, sorted by name.
+
+    `mtime` is only used as part of the cache key. A directory's mtime changes whenever
+    entries are added or removed, so new campaigns invalidate the cached listing.
+    """
+    with os.scandir(path_str) as entries:
+        return tuple(sorted(Path(e.path) for e in entries if e.is_dir() and not e.name.startswith('.')))
+
+def _list_subdirs(path: Path) -> tuple[Path, ...]:
+    """Lists the subdirectories of `path`, reusing the previous scan if the directory hasn't changed."""
+    return _scan_subdirs(str(path), path.stat().st_mtime)
+
+def _has_suffix(dir_path, suffix: str) -> bool:
+    """Checks whether a directory contains a file ending in `suffix`, stopping at the first match."""
+    with os.scandir(dir_path) as entries:
+        return any(e.name.endswith(suffix) and e.is_file() for e in entries)
+
+def _list_by_suffix(dir_path: Path, suffix: str) -> list[Path]:
+    """Lists the files in a directory that end in `suffix`, sorted by name."""
+    with os.scandir(dir_path) as entries:
+        return sorted(
+            (Path(e.path) for e in entries if e.name.endswith(suffix) and e.is_file()),
+            key=lambda p: p.name,
+        )
+
+@functools.lru_cache(maxsize=16)
+def _find_data_dirs(campaign_path: str, suffix: str) -> tuple[Path, ...]:
+    """
+    Finds the data subdirectories of a campaign's product directories that contain
+    files ending in `suffix`.
+    """
+    with os.scandir(campaign_path) as entries:
+        product_dirs = [e.path for e in entries if e.is_dir()]
+
+    matches = []
     for p_dir in product_dirs:
-        # Find subdirectories within the product directory that contain the target files
-        sub_dirs = [sd for sd in p_dir.iterdir() if sd.is_dir() and any(sd.glob(file_glob))]
-        potential_dirs.extend(sub_dirs)
-    
-    potential_dirs = sorted(potential_dirs)
+        with os.scandir(p_dir) as entries:
+            sub_dirs = [e.path for e in entries if e.is_dir()]
+        matches.extend(Path(sd) for sd in sub_dirs if _has_suffix(sd, suffix))
+    return tuple(sorted(matches))
+
+def _select_data_directory(campaign_path: Path, suffix: str, prompt_message: str) -> list[Path]:
+    """Helper to interactively select data subdirectories within a campaign."""
+    import questionary
+
+    potential_dirs = _find_data_dirs(str(campaign_path), suffix)
 
     if not potential_dirs:
         return []
@@ -44,6 +180,296 @@ def _select_data_directory(campaign_path: Path, file_glob: str, prompt_message:
     # Reconstruct full paths from the relative string paths
     return [campaign_path / name for name in selected_dirs_str]
 
+def _convert_one(
+    product_dir: Path, max_workers: int = None, num_threads='ALL_CPUS', show_progress: bool = True
+) -> None:
+    """Converts a single product directory. Runs in a worker process with its own processor."""
+    from .core import UavsarDownloader
+
+    if show_progress:
+        print(f"\n--- Processing: {product_dir.name} ---")
+    UavsarDownloader(skip_auth=True).process_product_directory(
+        product_dir, max_workers=max_workers, num_threads=num_threads, show_progress=show_progress
+    )
+
+def _stack_one(
+    product_dir: Path,
+    tiff_paths: list[Path],
+    vrt: bool = False,
+    quantize: bool = False,
+    num_threads='ALL_CPUS',
+    show_progress: bool = True,
+) -> None:
+    """Stacks the bands of a single product directory. Runs in a worker process with its own processor."""
+    from .core import UavsarDownloader
+
+    UavsarDownloader(skip_auth=True).stack_bands(
+        product_dir, tiff_paths, vrt=vrt, quantize=quantize, num_threads=num_threads,
+        show_progress=show_progress,
+    )
+
+def _threads_per_task(n_tasks: int, max_workers: int = None):
+    """
+    Returns the number of threads each of `n_tasks` tasks of `_run_in_processes` should use.
+    When they run in parallel processes they already occupy every CPU, so each uses one thread.
+    """
+    return 'ALL_CPUS' if n_tasks == 1 or max_workers == 1 else 1
+
+def _run_in_processes(worker, tasks: dict, max_workers: int = None):
+    """
+    Runs `worker(product_dir, *args)` for each `product_dir: args` entry of `tasks`.
+
+    Each product directory is independent and the work is CPU-bound, so they are spread
+    across processes. Failures are logged without stopping the other directories.
+
+    In processes, `worker` is called with `show_progress=False`: progress bars drawn by
+    several processes at once would overwrite each other, so a single bar counting the
+    finished directories is shown here instead.
+    """
+    if len(tasks) == 1 or max_workers == 1:
+        for p_dir, args in tasks.items():
+            try:
+                worker(p_dir, *args)
+            except Exception as e:
+                logging.error(f"Failed to process {p_dir.name}: {e}")
+        return
+
+    from rich.progress import BarColumn, Progress, TextColumn
+
+    with Progress(
+        TextColumn("[bold green]{task.description}"),
+        BarColumn(),
+        "({task.completed} of {task.total})"
+    ) as progress, ProcessPoolExecutor(max_workers=max_workers) as executor:
+        task = progress.add_task("Processing directories...", total=len(tasks))
+        futures = {
+            executor.submit(worker, p_dir, *args, show_progress=False): p_dir for p_dir, args in tasks.items()
+        }
+        for future in as_completed(futures):
+            p_dir = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Failed to process {p_dir.name}: {e}")
+            progress.advance(task)
+
+def _download_all(
+    scene_map: dict,
+    processor: "UavsarDownloader",
+    max_workers: int = 4,
+    unzip_executor=None,
+    keep_zip: bool = True,
+) -> list[str]:
+    """
+    Downloads the products of every scene concurrently.
+
+    Scene downloads are network-bound, so they are overlapped on a thread pool that
+    shares a single progress display. If `unzip_executor` is given, each scene's
+    archives are submitted to it as soon as that scene finishes, so extraction overlaps
+    with the remaining downloads. With `keep_zip` False, archives are extracted as they
+    download instead and never saved.
+
+    Returns:
+        The names of the scenes that failed to download or, with `unzip_executor`, to extract.
+    """
+    from .core import _already_extracted, _unzip_one
+
+    failed = []
+    unzip_futures = {}
+    with processor.download_progress() as progress, ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = {
+            ex.submit(processor.download_product, products, progress, keep_zip): scene_name
+            for scene_name, products in scene_map.items()
+        }
+        for future in as_completed(futures):
+            scene_name = futures[future]
+            try:
+                product_dir, base_name = future.result()
+            except Exception as e:
+                logging.error(f"Unexpected error while downloading scene {scene_name}: {e}")
+                product_dir, base_name = None, None
+
+            if not (product_dir and base_name):
+                failed.append(scene_name)
+                continue
+
+            logging.info(f"Download for {base_name} complete.")
+            if unzip_executor:
+                filenames = {p.properties['url'].split('/')[-1] for p in scene_map[scene_name]}
+                zip_paths = [product_dir / f for f in sorted(filenames) if f.endswith('.zip')]
+                unzip_futures.update(
+                    (unzip_executor.submit(_unzip_one, zip_path), (scene_name, zip_path))
+                    for zip_path in zip_paths
+                    if zip_path.exists() and not _already_extracted(zip_path)
+                )
+
+    for future in wait(unzip_futures).done:
+        scene_name, zip_path = unzip_futures[future]
+        try:
+            error = future.result()[1]
+        except Exception as e:  # e.g. BrokenProcessPool if a worker died
+            error = repr(e)
+        if error:
+            logging.error(f"Failed to unzip {zip_path.name}: {error}")
+            if scene_name not in failed:
+                failed.append(scene_name)
+    return failed
+
+def _interactive_search_wizard(
+    processor: "UavsarDownloader",
+    params: SearchParams,
+    prompt: bool = True,
+) -> SearchParams | None:
+    """
+    Prompts for the values of `params` that were not given on the command line.
+
+    Values that are already set are used as they are, so a fully specified `params`
+    never prompts. With `prompt=False`, missing dates default to the campaign's date
+    range instead of being asked for. The processor's campaign is set as a side effect.
+
+    Returns:
+        The completed search parameters, or None if the user cancelled a prompt.
+    """
+    import questionary
+
+    # 1. Select Campaign
+    campaigns = processor.get_available_campaigns()
+    if not campaigns:
+        logging.error("Could not retrieve campaign list. Please check your connection. Exiting.")
+        return None
+
+    campaign = params.campaign
+    if campaign is None:
+        campaign = questionary.select("Please select a campaign:", choices=campaigns).ask()
+        if not campaign: return None
+    elif campaign not in campaigns:
+        logging.error(f"Unknown campaign '{campaign}'. Run 'uavsar search' without --campaign to list them.")
+        return None
+    processor.set_campaign(campaign)
+
+    # Get the date range for the selected campaign to use as defaults. This searches the
+    # whole campaign, so it runs while the user is choosing processing levels.
+    date_range_future = None
+    if params.start_date is None or params.end_date is None:
+        date_range_future = _in_background(processor.get_campaign_date_range)
+
+    # 2. Select Processing Level
+    levels = params.levels
+    if not levels:
+        # The date range lookup logs from its thread while this prompt is open.
+        with _held_logs():
+            selected_level_descriptions = questionary.checkbox(
+                "Select processing levels to search for (space to select, enter to confirm):",
+                choices=list(PROCESSING_LEVELS.keys()),
+                validate=lambda result: True if len(result) > 0 else "Please select at least one level."
+            ).ask()
+        if not selected_level_descriptions: return None
+
+        # Get the short names (e.g., 'GRD_HD') for the API call
+        levels = [PROCESSING_LEVELS[desc] for desc in selected_level_descriptions]
+
+    # 3. Get Date Range
+    start_date, end_date = params.start_date, params.end_date
+    if date_range_future:
+        start_date_default, end_date_default = date_range_future.result()
+        if not prompt:
+            return SearchParams(campaign, levels, start_date or start_date_default, end_date or end_date_default)
+        if start_date is None:
+            start_date = questionary.text(
+                "Enter start date (YYYY-MM-DD):",
+                default=start_date_default or "",
+                validate=is_valid_date
+            ).ask()
+            if not start_date: return None
+        if end_date is None:
+            end_date = questionary.text(
+                "Enter end date (YYYY-MM-DD):",
+                default=end_date_default or "",
+                validate=is_valid_date
+            ).ask()
+            if not end_date: return None
+
+    return SearchParams(campaign, levels, start_date, end_date)
+
+def _select_products(results: list, scene_names: list[str]) -> list[int]:
+    """Prompts for the products to download, grouped by scene. Returns their indices in `results`."""
+    import questionary
+    from questionary import Choice, Separator
+
+    # The groups are created up front in display order.
+    product_groups = {scene_name: [] for scene_name in sorted(set(scene_names))}
+    for i, (scene_name, p) in enumerate(zip(scene_names, results)):
+        product_groups[scene_name].append((i, p))
+
+    # Build the choices in one pass as Choice objects, so questionary doesn't have to
+    # convert a dict per product. Each choice returns the product's original index.
+    product_choices = [
+        choice
+        for scene_name, products_in_group in product_groups.items()
+        for choice in (
+            Separator(f"--- {scene_name} ---"),
+            *(Choice(f"  [{i + 1}] {p.properties['processingLevel']}", value=i) for i, p in products_in_group),
+        )
+    ]
+
+    return questionary.checkbox(
+        "Select products to download (space to select, enter to confirm):",
+        choices=product_choices,
+        validate=lambda result: True if len(result) > 0 else "Please select at least one product."
+    ).ask() or []
+
+def _run_search(
+    processor: "UavsarDownloader",
+    params: SearchParams,
+    select_all: bool = False,
+    jobs: int = 4,
+    unzip: bool = False,
+    keep_zip: bool = True,
+) -> list[str] | None:
+    """
+    Searches with fully specified `params` and downloads the results.
+
+    All results are downloaded when `select_all` is set; otherwise the products are
+    chosen from a prompt. The processor's campaign must already be set.
+
+    Returns:
+        The names of the scenes that failed to download or extract, or None if nothing was downloaded.
+    """
+    from .core import MP_CONTEXT
+
+    # 4. Search for data
+    results = processor.search_data(params.start_date, params.end_date, params.levels)
+    if not results:
+        logging.warning("No products found for the given criteria.")
+        return None
+
+    # 5. Select Products to Download
+    # Look up each product's scene once.
+    scene_names = [p.properties['sceneName'] for p in results]
+    if select_all:
+        selected_indices = list(range(len(results)))
+        logging.info(f"Downloading all {len(results)} product(s) found.")
+    else:
+        selected_indices = _select_products(results, scene_names)
+
+    if not selected_indices:
+        logging.info("No products selected. Exiting.")
+        return None
+
+    # 6. Group selections by scene and download efficiently
+    selected_products_by_scene = {scene_names[idx]: [] for idx in selected_indices}
+    for idx in selected_indices:
+        selected_products_by_scene[scene_names[idx]].append(results[idx])
+
+    # Without kept archives, each download thread extracts its own archive as it arrives.
+    with ProcessPoolExecutor(mp_context=MP_CONTEXT) if unzip and keep_zip else nullcontext() as unzip_pool:
+        failed_scenes = _download_all(
+            selected_products_by_scene, processor, max_workers=jobs, unzip_executor=unzip_pool,
+            keep_zip=keep_zip,
+        )
+    processor.save_auth_cache()
+    return failed_scenes
+
 @app.command()
 def search(
     work_dir: Path = typer.Option(
@@ -52,130 +478,110 @@ def search(
         "-d",
         help="The directory to download and store processed files. Defaults to '~/uavsar_data'.",
         resolve_path=True,
-    )
+    ),
+    campaign: str = typer.Option(
+        None,
+        "--campaign",
+        "-c",
+        help="Campaign to search, e.g. 'Winnipeg, Canada'. Prompted for if not given.",
+    ),
+    levels: list[str] = typer.Option(
+        None,
+        "--level",
+        "-l",
+        callback=_check_levels,
+        help="Processing level to search for, e.g. GRD_HD. Repeat for several levels. Prompted for if not given.",
+    ),
+    start_date: str = typer.Option(
+        None,
+        "--start",
+        callback=_check_date,
+        help="Start date (YYYY-MM-DD). Defaults to the campaign's first acquisition with --yes.",
+    ),
+    end_date: str = typer.Option(
+        None,
+        "--end",
+        callback=_check_date,
+        help="End date (YYYY-MM-DD). Defaults to the campaign's last acquisition with --yes.",
+    ),
+    yes: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        help="Run without prompts and download every product found. Requires --campaign and --level.",
+    ),
+    jobs: int = typer.Option(
+        4,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Maximum number of scenes to download concurrently.",
+    ),
+    unzip: bool = typer.Option(
+        False,
+        "--unzip",
+        help="Extract each scene's archives while the remaining scenes are still downloading.",
+    ),
+    keep_zip: bool = typer.Option(
+        True,
+        "--keep-zip/--no-keep-zip",
+        help="With --unzip, keep the downloaded archives. --no-keep-zip extracts them as they download without saving them.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Ignore cached campaign information and fetch it again from ASF.",
+    ),
+    re_auth: bool = typer.Option(
+        False,
+        "--re-auth",
+        help="Discard the saved Earthdata login session and log in again.",
+    ),
 ):
     """Search for and download UAVSAR data from ASF."""
-    try:
-        processor = UavsarDownloader(work_dir=work_dir)
-
-        # 1. Select Campaign
-        campaigns = processor.get_available_campaigns()
-        if not campaigns:
-            logging.error("Could not retrieve campaign list. Please check your connection. Exiting.")
-            raise typer.Exit()
-        
-        selected_campaign = questionary.select("Please select a campaign:", choices=campaigns).ask()
-        if not selected_campaign: raise typer.Exit()
-        processor.set_campaign(selected_campaign)
-
-        # Get the date range for the selected campaign to use as defaults
-        start_date_default, end_date_default = processor.get_campaign_date_range()
-
-        # 2. Select Processing Level
-        processing_level_choices = {
-            # Geocoded Data (best for current GeoTIFF conversion)
-            "GRD_HD (High-Resolution Geocoded)": "GRD_HD",
-            "GRD_MD (Medium-Resolution Geocoded)": "GRD_MD",
-            "AMPLITUDE_GRD (Amplitude Geocoded)": "AMPLITUDE_GRD",
-            "INTERFEROMETRY_GRD (Interferometry Geocoded)": "INTERFEROMETRY_GRD",
-
-            # Slant Range Data
-            "COMPLEX (Complex Slant Range)": "COMPLEX",
-            "AMPLITUDE (Amplitude Slant Range)": "AMPLITUDE",
-            "INTERFEROMETRY (Interferometry Slant Range)": "INTERFEROMETRY",
-
-            # Projected Data
-            "PROJECTED (Projected)": "PROJECTED",
-            "PROJECTED_ML3X3 (Projected, 3x3 Multi-looked)": "PROJECTED_ML3X3",
-            "PROJECTED_ML5X5 (Projected, 5x5 Multi-looked)": "PROJECTED_ML5X5",
-
-            # Auxiliary Products
-            "INC (Incidence Angle Map)": "INC",
-            "SLOPE (Slope Map)": "SLOPE",
-            "DEM_TIFF (Digital Elevation Model GeoTIFF)": "DEM_TIFF",
-            "PAULI (Pauli Decomposition)": "PAULI",
-        }
-        selected_level_descriptions = questionary.checkbox(
-            "Select processing levels to search for (space to select, enter to confirm):",
-            choices=list(processing_level_choices.keys()),
-            validate=lambda result: True if len(result) > 0 else "Please select at least one level."
-        ).ask()
+    from .core import UavsarDownloader
 
-        if not selected_level_descriptions:
-            raise typer.Exit()
+    if yes and not (campaign and levels):
+        raise typer.BadParameter("--yes requires --campaign and at least one --level.")
+    if not (keep_zip or unzip):
+        raise typer.BadParameter("--no-keep-zip requires --unzip.")
 
-        # Get the short names (e.g., 'GRD_HD') for the API call
-        selected_levels = [processing_level_choices[desc] for desc in selected_level_descriptions]
-
-        # 3. Get Date Range
-        start_date = questionary.text(
-            "Enter start date (YYYY-MM-DD):",
-            default=start_date_default or "",
-            validate=is_valid_date
-        ).ask()
-        if not start_date: raise typer.Exit()
-        end_date = questionary.text(
-            "Enter end date (YYYY-MM-DD):",
-            default=end_date_default or "",
-            validate=is_valid_date
-        ).ask()
-        if not end_date: raise typer.Exit()
-
-        # 4. Search for data
-        results = processor.search_data(start_date, end_date, selected_levels)
-        if not results:
-            logging.warning("No products found for the given criteria.")
-            raise typer.Exit()
-
-        # 5. Select Products to Download
-        from collections import defaultdict
-        product_groups = defaultdict(list)
-        for i, p in enumerate(results):
-            product_groups[p.properties['sceneName']].append((i, p))
-
-        product_choices = []
-        for scene_name, products_in_group in sorted(product_groups.items()):
-            product_choices.append(Separator(f"--- {scene_name} ---"))
-            for original_index, product in products_in_group:
-                display_text = f"  [{original_index + 1}] {product.properties['processingLevel']}"
-                product_choices.append({
-                    'name': display_text,
-                    'value': original_index  # Return the original index
-                })
-
-        selected_indices = questionary.checkbox(
-            "Select products to download (space to select, enter to confirm):",
-            choices=product_choices,
-            validate=lambda result: True if len(result) > 0 else "Please select at least one product."
-        ).ask()
-
-        if not selected_indices:
-            logging.info("No products selected. Exiting.")
-            raise typer.Exit()
-
-        # 6. Group selections by scene and download efficiently
-        selected_products_by_scene = defaultdict(list)
-        for idx in selected_indices:
-            product = results[idx]
-            selected_products_by_scene[product.properties['sceneName']].append(product)
-
-        for scene_name, products_to_download in selected_products_by_scene.items():
-            # Pass the whole list of products for the scene to the download function
-            product_dir, base_name = processor.download_product(products_to_download)
+    try:
+        processor = UavsarDownloader(work_dir=work_dir, refresh_auth=re_auth, download_scenes=jobs)
+        processor.use_cache = not no_cache
+
+        params = _interactive_search_wizard(
+            processor, SearchParams(campaign, levels, start_date, end_date), prompt=not yes
+        )
+        # Without prompts nothing can be cancelled, so stopping early is a failure.
+        if params is None: raise typer.Exit(code=1 if yes else 0)
+        if not (params.start_date and params.end_date):
+            logging.error("Could not determine the campaign's date range. Please pass --start and --end.")
+            raise typer.Exit(code=1)
+
+        failed_scenes = _run_search(processor, params, select_all=yes, jobs=jobs, unzip=unzip, keep_zip=keep_zip)
+        if failed_scenes is None: raise typer.Exit(code=1 if yes else 0)
+        for scene_name in failed_scenes:
+            logging.warning(f"Failed to download or extract files for product scene {scene_name}. Skipping.")
+        if failed_scenes:
+            logging.error(f"{len(failed_scenes)} scene(s) failed to download or extract.")
+            raise typer.Exit(code=1)
 
-            if not (product_dir and base_name):
-                logging.warning(f"Failed to download files for product scene {scene_name}. Skipping.")
-                continue
-            
-            logging.info(f"Download for {base_name} complete.")
-        
         print("\n--- All downloads complete. ---")
-        print("Next steps: Run 'uavsar unzip' to extract archives, then 'uavsar convert' and 'uavsar stack'.")
+        if unzip:
+            print("Next steps: Run 'uavsar convert' and then 'uavsar stack'.")
+        else:
+            print("Next steps: Run 'uavsar unzip' to extract archives, then 'uavsar convert' and 'uavsar stack'.")
 
-    except (KeyboardInterrupt, typer.Exit):
+    except typer.Exit as e:
+        if e.exit_code:
+            raise
+        logging.warning("\nOperation cancelled by user.")
+    except KeyboardInterrupt:
         logging.warning("\nOperation cancelled by user.")
     except Exception as e:
         logging.error(f"An unexpected error occurred: {e}", exc_info=True)
+        raise typer.Exit(code=1)
 
 @app.command()
 def unzip(
@@ -189,20 +595,36 @@ def unzip(
         dir_okay=True,
         readable=True,
         resolve_path=True,
-    )
+    ),
+    jobs: int = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of archives to extract in parallel. Defaults to the number of CPUs.",
+    ),
+    force: bool = typer.Option(
+        False,
+        "--force",
+        help="Extract archives again even if their contents already exist.",
+    ),
 ):
     """Unzips downloaded .zip files within a product directory."""
+    from .core import UavsarDownloader
+
     try:
         processor = UavsarDownloader(skip_auth=True)
 
         zip_files_to_process = []
         if product_dir:
             print(f"--- Unzipping files in specified directory: {product_dir} ---")
-            zip_files_to_process.extend(list(product_dir.glob('*.zip')))
+            zip_files_to_process.extend(_list_by_suffix(product_dir, '.zip'))
         else:
             # Interactive selection
+            import questionary
+
             print(f"--- Scanning for campaigns in base directory: {processor.base_work_dir} ---")
-            campaign_dirs = sorted([d for d in processor.base_work_dir.iterdir() if d.is_dir()])
+            campaign_dirs = _list_subdirs(processor.base_work_dir)
             if not campaign_dirs:
                 logging.warning(f"No campaign directories found in {processor.base_work_dir}. Exiting.")
                 raise typer.Exit()
@@ -223,7 +645,7 @@ def unzip(
                 # Check for already unzipped dirs to provide a better message
                 unzipped_dirs = sorted([
                     d for d in campaign_path.iterdir()
-                    if d.is_dir() and any(d.glob('*.grd')) and not any(d.glob('*.zip'))
+                    if d.is_dir() and _has_suffix(d, '.grd') and not _has_suffix(d, '.zip')
                 ])
                 if unzipped_dirs:
                     logging.info("Tip: Some directories appear to be already unzipped. You can use 'uavsar convert' on them directly.")
@@ -246,7 +668,7 @@ def unzip(
         if not zip_files_to_process:
             logging.info("No .zip files found to unzip.")
         else:
-            processor.unzip_files(zip_files_to_process)
+            processor.unzip_files(zip_files_to_process, max_workers=jobs, force=force)
 
         print("\n--- Unzipping complete. ---")
     except (KeyboardInterrupt, typer.Exit):
@@ -266,9 +688,18 @@ def convert(
         dir_okay=True,
         readable=True,
         resolve_path=True,
-    )
+    ),
+    jobs: int = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of directories to process in parallel. Defaults to the number of CPUs.",
+    ),
 ):
     """Converts existing, downloaded UAVSAR products to GeoTIFFs."""
+    from .core import UavsarDownloader
+
     try:
         # Authentication is not needed for local conversion.
         processor = UavsarDownloader(skip_auth=True)
@@ -278,8 +709,10 @@ def convert(
             dirs_to_process.append(product_dir)
             print(f"--- Converting specified directory: {product_dir} ---")
         else:
+            import questionary
+
             print(f"--- Scanning for campaigns in base directory: {processor.base_work_dir} ---")
-            campaign_dirs = sorted([d for d in processor.base_work_dir.iterdir() if d.is_dir()])
+            campaign_dirs = _list_subdirs(processor.base_work_dir)
 
             if not campaign_dirs:
                 logging.warning(f"No campaign directories found in {processor.base_work_dir}. Exiting.")
@@ -292,16 +725,20 @@ def convert(
             if not selected_campaign_name: raise typer.Exit()
 
             campaign_path = processor.base_work_dir / selected_campaign_name
-            dirs_to_process = _select_data_directory(campaign_path, '*.ann', 'Select data directories to convert:')
+            dirs_to_process = _select_data_directory(campaign_path, '.ann', 'Select data directories to convert:')
 
             if not dirs_to_process:
                 logging.warning(f"No convertible data directories found in {campaign_path.name}. Run 'uavsar unzip' first.")
                 logging.info("No directories selected. Exiting.")
                 raise typer.Exit()
 
-        for p_dir in dirs_to_process:
-            print(f"\n--- Processing: {p_dir.name} ---")
-            processor.process_product_directory(p_dir)
+        # Several directories are converted in parallel with their files one at a time, and a
+        # single directory converts its files in parallel instead.
+        file_jobs = jobs if len(dirs_to_process) == 1 else 1
+        num_threads = _threads_per_task(len(dirs_to_process), jobs)
+        _run_in_processes(
+            _convert_one, {p_dir: (file_jobs, num_threads) for p_dir in dirs_to_process}, max_workers=jobs
+        )
 
         print("\n--- Conversion complete. ---")
     except (KeyboardInterrupt, typer.Exit):
@@ -321,9 +758,36 @@ def stack(
         dir_okay=True,
         readable=True,
         resolve_path=True,
-    )
+    ),
+    jobs: int = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of directories to process in parallel. Defaults to the number of CPUs.",
+    ),
+    all_tiffs: bool = typer.Option(
+        False,
+        "--all-tiffs",
+        help="Stack every GeoTIFF in each directory instead of prompting for the bands.",
+    ),
+    vrt: bool = typer.Option(
+        False,
+        "--vrt",
+        help="Write a virtual stack (.vrt) that references the band GeoTIFFs instead of copying them.",
+    ),
+    quantize: bool = typer.Option(
+        False,
+        "--quantize",
+        help="Write an 8-bit preview stack (_stack_uint8.tif), with each band scaled between its 2nd and 98th percentiles.",
+    ),
 ):
     """Stacks selected single-band GeoTIFFs into a multi-band GeoTIFF."""
+    from .core import UavsarDownloader
+
+    if vrt and quantize:
+        raise typer.BadParameter("--quantize cannot be combined with --vrt.")
+
     try:
         processor = UavsarDownloader(skip_auth=True)
 
@@ -332,8 +796,10 @@ def stack(
             dirs_to_process.append(product_dir)
             print(f"--- Stacking bands for specified directory: {product_dir} ---")
         else:
+            import questionary
+
             print(f"--- Scanning for campaigns in base directory: {processor.base_work_dir} ---")
-            campaign_dirs = sorted([d for d in processor.base_work_dir.iterdir() if d.is_dir()])
+            campaign_dirs = _list_subdirs(processor.base_work_dir)
             if not campaign_dirs:
                 logging.warning(f"No campaign directories found in {processor.base_work_dir}. Exiting.")
                 raise typer.Exit()
@@ -344,26 +810,43 @@ def stack(
             if not selected_campaign_name: raise typer.Exit()
 
             campaign_path = processor.base_work_dir / selected_campaign_name
-            dirs_to_process = _select_data_directory(campaign_path, '*.tiff', 'Select data directories to stack bands from:')
+            dirs_to_process = _select_data_directory(campaign_path, '.tiff', 'Select data directories to stack bands from:')
 
             if not dirs_to_process:
                 logging.warning(f"No data directories with .tiff files found in {campaign_path.name}. Run 'uavsar convert' first.")
                 raise typer.Exit()
 
+        stack_tasks = {}
         for p_dir in dirs_to_process:
             print(f"\n--- Stacking: {p_dir.name} ---")
-            
-            available_tiffs = sorted(list(p_dir.glob('*.tiff')))
+
+            # The stack is written to the product directory, so only one data directory per product can be stacked.
+            if any(d.parent == p_dir.parent for d in stack_tasks):
+                logging.info(f"A stack for {p_dir.parent.name} is already being created. Skipping {p_dir.name}.")
+                continue
+
+            available_tiffs = _list_by_suffix(p_dir, '.tiff')
             if not available_tiffs:
                 logging.warning(f"No .tiff files found in {p_dir}. Run 'uavsar convert' on this directory first.")
                 continue
 
+            if all_tiffs:
+                stack_tasks[p_dir] = (available_tiffs, vrt, quantize)
+                continue
+
+            import questionary
+
             tiff_choices = [p.name for p in available_tiffs]
             selected_tiffs_str = questionary.checkbox("Select bands (GeoTIFFs) to stack:", choices=tiff_choices).ask()
             if not selected_tiffs_str: continue
 
-            selected_tiff_paths = [p_dir / name for name in selected_tiffs_str]
-            processor.stack_bands(p_dir, selected_tiff_paths)
+            stack_tasks[p_dir] = ([p_dir / name for name in selected_tiffs_str], vrt, quantize)
+
+        # Bands are selected interactively first, then the stacks are written in parallel.
+        if stack_tasks:
+            num_threads = _threads_per_task(len(stack_tasks), jobs)
+            stack_tasks = {p_dir: (*args, num_threads) for p_dir, args in stack_tasks.items()}
+            _run_in_processes(_stack_one, stack_tasks, max_workers=jobs)
 
         print("\n--- Stacking complete. ---")
     except (KeyboardInterrupt, typer.Exit):
@@ -1,17 +1,38 @@
 import asf_search
+import functools
 import getpass
+import io
+import json
 import logging
+import math
+import multiprocessing
 import numpy as np
 import os
 import pandas as pd
 import pytz
 import rasterio
 import re
+import shutil
+import tempfile
+import time
 from rich.progress import Progress, BarColumn, TextColumn, TransferSpeedColumn, TimeRemainingColumn
 import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager, nullcontext
 from pathlib import Path
 from rasterio.transform import Affine
 from rasterio.crs import CRS
+from rasterio.windows import Window
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+
+try:
+    # Optional: ISA-L's SIMD-accelerated inflate is roughly twice as fast as zlib's
+    from isal import isal_zlib
+except ImportError:
+    isal_zlib = None
+from urllib3.util.retry import Retry
 
 # Configure basic logging
 logging.basicConfig(
@@ -20,13 +41,353 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S',
 )
 
+# Earthdata login cookies are kept between runs so downloads can skip the login redirects.
+AUTH_CACHE_FILE = Path.home() / '.cache' / 'uavsar' / 'auth_cookies.json'
+
+# Large reads keep the per-chunk Python overhead (write call and progress update) negligible.
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Archives extracted while downloading are held in memory up to this size, larger ones go to disk.
+# Several downloads run at once, so this stays modest.
+SPOOL_MAX_SIZE = 64 << 20
+
+# One line of an annotation file: `key (units) = value ; comment`, where units and comment are optional.
+# Greedy classes rather than lazy quantifiers, so matching barely backtracks.
+_ANN_LINE = re.compile(r'\s*(?P<key>[^=;()]*[^=;()\s])\s*(?:\((?P<units>[^)]*)\))?\s*=(?P<value>[^;]*)(?:;(?P<comment>.*))?')
+
+# Version of the parsed annotation format in the `.ann` caches. Bump it when the parser's output changes.
+_ANN_CACHE_VERSION = 2
+# Acquisition times are the only non-JSON values, stored in the cache as tagged ISO strings.
+_ANN_TIMEZONE = pytz.timezone('US/Mountain')
+
+def _ann_cache_encode(value):
+    """JSON `default` for the annotation cache."""
+    if isinstance(value, pd.Timestamp):
+        return {'__timestamp__': value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _ann_cache_decode(obj: dict):
+    """JSON `object_hook` for the annotation cache."""
+    if '__timestamp__' in obj:
+        return pd.Timestamp(obj['__timestamp__']).astimezone(_ANN_TIMEZONE)
+    return obj
+
+# Polarization of a GRD file, e.g. `...L090HHHV_CX_01.grd` -> `HHHV`.
+_GRD_POL_RE = re.compile(r'L\d{3}([HV]{4})_CX')
+# NumPy dtypes of the annotation's `val_frmt` values. UAVSAR binaries are little-endian.
+_FMT_TO_DTYPE = {
+    'REAL*4': np.dtype('<f4'),
+    'REAL*8': np.dtype('<f8'),
+    'COMPLEX*8': np.dtype('<c8'),
+    'INTEGER*2': np.dtype('<i2'),
+    'BYTE': np.dtype('u1'),
+}
+# Co-pol GRD products are real power images; all other polarizations are complex.
+_COPOL = frozenset({'HHHH', 'VVVV', 'HVHV', 'VHVH'})
+# CRS of equiangular (lat/lon) products, built once rather than looked up in PROJ per band.
+_WGS84 = CRS.from_epsg(4326)
+# Characters dropped from campaign names when naming their directories.
+_CAMPAIGN_SANITIZER = re.compile(r'[^\w\s-]')
+
+# Worker processes are started while download or progress threads are running, and forking
+# a threaded process can deadlock the child. Forkserver children start from a clean process.
+MP_CONTEXT = multiprocessing.get_context('forkserver' if os.name == 'posix' else 'spawn')
+
+# GDAL settings for reading and writing local GeoTIFFs. Opening a file no longer lists its
+# (large) directory, and the free space check before each write is skipped. The block cache
+# is per process, so it is kept moderate for the conversion worker pool.
+GDAL_CONFIG = {
+    'GDAL_CACHEMAX': 512,
+    'GDAL_DISABLE_READDIR_ON_OPEN': 'EMPTY_DIR',
+    'CHECK_DISK_FREE_SPACE': 'NO',
+}
+
+# Tile size of converted GeoTIFFs. The rasters are also converted one row of tiles at a time.
+CONVERT_BLOCK_SIZE = 512
+
+# Page-cache hints for the one-shot sequential reads of raw rasters; POSIX only.
+_FADVISE = hasattr(os, 'posix_fadvise')
+
+@functools.cache
+def _cmag_kernel():
+    """
+    Returns a compiled kernel for the complex magnitude, or None if numba is not installed.
+    numba is imported on the first complex block, so runs without one don't pay for it.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+
+    # Serial on purpose: files are already converted in parallel worker processes, and a
+    # numba thread pool in each of them would oversubscribe the cores.
+    @njit(fastmath=True, cache=True)
+    def _cmag(c, out):
+        """Writes the magnitude of the 2D complex array `c` into `out`."""
+        for i in range(c.shape[0]):
+            for j in range(c.shape[1]):
+                real, imag = c[i, j].real, c[i, j].imag
+                out[i, j] = math.sqrt(real * real + imag * imag)
+    return _cmag
+
+def _magnitude(block: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Returns the magnitude of a 2D complex block as float32, with numba when available.
+    It is written into `out` if given, so a conversion can reuse one buffer for every block.
+    """
+    if out is None:
+        out = np.empty(block.shape, dtype=np.float32)
+    kernel = _cmag_kernel()
+    if kernel is None:
+        return np.abs(block, out=out)
+    kernel(block, out)
+    return out
+
+def _read_blocks(path: Path, dtype: np.dtype, rows: int, cols: int, block_rows: int):
+    """
+    Yields `(row0, block)` for consecutive blocks of `block_rows` rows of a raw raster file.
+
+    The file is read once, front to back, so the kernel is told so, and each block is dropped
+    from the page cache once read, so a multi-GB file doesn't evict everything else. The next
+    block is read on a background thread while the caller processes the current one; the two
+    alternate between a pair of buffers, so a yielded block is only valid until the next one.
+    """
+    buffers = [np.empty((block_rows, cols), dtype=dtype) for _ in range(2)]
+    row_starts = range(0, rows, block_rows)
+
+    with open(path, 'rb', buffering=0) as f, ThreadPoolExecutor(max_workers=1) as reader:
+        if _FADVISE:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        def read(i):
+            block = buffers[i % 2][:min(block_rows, rows - row_starts[i])]
+            offset = f.tell()
+            if f.readinto(block.reshape(-1).view(np.uint8)) != block.nbytes:
+                raise IOError(f"{path.name} is shorter than expected")
+            if _FADVISE:
+                os.posix_fadvise(f.fileno(), offset, block.nbytes, os.POSIX_FADV_DONTNEED)
+            return block
+
+        pending = reader.submit(read, 0) if row_starts else None
+        for i, row0 in enumerate(row_starts):
+            block = pending.result()
+            # The other buffer was handed out last time round, and the caller is done with it.
+            if i + 1 < len(row_starts):
+                pending = reader.submit(read, i + 1)
+            yield row0, block
+
+@contextmanager
+def _partial_output(out_fp: Path):
+    """
+    Yields a `.partial` path to write `out_fp` to, and moves it into place once the block
+    exits without error. On an error the partial file is removed, so an existing `out_fp`
+    is always complete and can safely be skipped by later runs.
+    """
+    partial_fp = out_fp.with_name(out_fp.name + '.partial')
+    partial_fp.unlink(missing_ok=True)  # Left behind by a run that was killed
+    try:
+        yield partial_fp
+    except BaseException:
+        partial_fp.unlink(missing_ok=True)
+        raise
+    # Nothing is written when the caller returns early, e.g. after failed validation
+    if partial_fp.exists():
+        os.replace(partial_fp, out_fp)
+
+def _write_vrt(out_fp: Path, srcs: list, descriptions: list[str]):
+    """
+    Writes a GDAL VRT that stacks the open, aligned single-band datasets `srcs` as its bands.
+    Sources are referenced relative to the VRT, so the product directory can be moved.
+    """
+    first = srcs[0]
+    root = ET.Element('VRTDataset', rasterXSize=str(first.width), rasterYSize=str(first.height))
+    if first.crs:
+        ET.SubElement(root, 'SRS').text = first.crs.to_wkt()
+    ET.SubElement(root, 'GeoTransform').text = ', '.join(repr(v) for v in first.transform.to_gdal())
+
+    for i, (src, description) in enumerate(zip(srcs, descriptions), start=1):
+        data_type = rasterio.dtypes.typename_fwd[rasterio.dtypes.dtype_rev[src.dtypes[0]]]
+        band = ET.SubElement(root, 'VRTRasterBand', dataType=data_type, band=str(i))
+        ET.SubElement(band, 'Description').text = description
+        if src.nodata is not None:
+            ET.SubElement(band, 'NoDataValue').text = repr(src.nodata)
+        source = ET.SubElement(band, 'SimpleSource')
+        ET.SubElement(source, 'SourceFilename', relativeToVRT='1').text = \
+            Path(os.path.relpath(src.name, out_fp.parent)).as_posix()
+        ET.SubElement(source, 'SourceBand').text = '1'
+        block_y, block_x = src.block_shapes[0]
+        ET.SubElement(source, 'SourceProperties', RasterXSize=str(src.width), RasterYSize=str(src.height),
+                      DataType=data_type, BlockXSize=str(block_x), BlockYSize=str(block_y))
+        rect = {'xOff': '0', 'yOff': '0', 'xSize': str(src.width), 'ySize': str(src.height)}
+        ET.SubElement(source, 'SrcRect', rect)
+        ET.SubElement(source, 'DstRect', rect)
+
+    ET.indent(root)
+    ET.ElementTree(root).write(out_fp, encoding='unicode')
+
+def _percentile_range(src, lo: float = 2, hi: float = 98) -> tuple[float, float]:
+    """
+    Returns the `lo` and `hi` percentiles of the valid pixels of band 1 of `src`. They are
+    estimated from a decimated read, so the whole band never has to be in memory.
+    """
+    out_shape = (max(1, src.height // 8), max(1, src.width // 8))
+    sample = src.read(1, out_shape=out_shape, masked=True).compressed()
+    sample = sample[np.isfinite(sample)]
+    if not sample.size:
+        return 0.0, 0.0
+    v_min, v_max = np.percentile(sample, [lo, hi])
+    return float(v_min), float(v_max)
+
+def _quantize_to_uint8(block: np.ndarray, v_min: float, v_max: float, nodata=None) -> np.ndarray:
+    """
+    Linearly maps `block` from [v_min, v_max] onto 1-255, clipping values outside it.
+    Nodata and non-finite pixels become 0.
+    """
+    invalid = ~np.isfinite(block)
+    if nodata is not None:
+        invalid |= block == nodata
+    # Replace invalid pixels before scaling, since casting NaN or inf to uint8 is undefined
+    block = np.where(invalid, v_min, block)
+    scale = 254.0 / (v_max - v_min) if v_max > v_min else 0.0
+    out = ((np.clip(block, v_min, v_max) - v_min) * scale + 1).astype(np.uint8)
+    out[invalid] = 0
+    return out
+
+def _index_annotation(ann_data: dict) -> dict[str, frozenset]:
+    """
+    Maps each field of a parsed annotation (e.g. 'set_rows') to the set of layer prefixes
+    that define it (e.g. {'grd_pwr', 'hgt'}), so metadata blocks can be found without
+    formatting and probing one key per candidate prefix.
+    """
+    index = {}
+    for key in ann_data:
+        prefix, sep, field = key.partition('.')
+        if sep:
+            index.setdefault(field, set()).add(prefix)
+    return {field: frozenset(prefixes) for field, prefixes in index.items()}
+
+def _member_path(extract_dir: Path, filename: str) -> Path:
+    """
+    Returns where an archive member is extracted to. Empty, '.' and '..' components are
+    dropped, as ZipFile.extract does, so members can't escape `extract_dir`.
+    """
+    return extract_dir.joinpath(*(part for part in filename.split('/') if part not in ('', '.', '..')))
+
+def _extract_member(zip_ref: zipfile.ZipFile, member: zipfile.ZipInfo, extract_dir: Path):
+    """
+    Extracts a single archive member, inflating it with ISA-L when it is installed.
+    """
+    if isal_zlib is None or member.compress_type != zipfile.ZIP_DEFLATED or member.is_dir() or os.name != 'posix':
+        zip_ref.extract(member, extract_dir)
+        return
+
+    target = _member_path(extract_dir, member.filename)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with zip_ref.open(member) as src, open(target, 'wb') as dst:
+        # ZipExtFile reads lazily, so its decompressor can be swapped before the first read.
+        # Header parsing and the CRC check are still done by zipfile.
+        src._decompressor = isal_zlib.decompressobj(-15)
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+def _already_extracted(zip_path: Path) -> bool:
+    """
+    Checks whether an archive has already been fully extracted, by comparing the size of
+    each extracted file with the size recorded in the archive's central directory.
+    """
+    extract_dir = zip_path.parent / zip_path.stem
+    if not extract_dir.is_dir():
+        return False
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            members = [m for m in zip_ref.infolist() if not m.is_dir()]
+        return all(_member_path(extract_dir, m.filename).stat().st_size == m.file_size for m in members)
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+def _unzip_one(zip_path: Path) -> tuple[Path, str | None]:
+    """
+    Extracts a zip file into a subdirectory named after it, next to the archive.
+
+    This is a module-level function so it can be sent to worker processes. Errors are
+    returned as a string rather than raised, so one bad archive does not stop the others.
+    Callers check `_already_extracted` first to skip archives that don't need extracting.
+
+    Returns:
+        A tuple of (Path, str) for the archive and the error message, or None on success.
+    """
+    extract_dir = zip_path.parent / zip_path.stem
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            logging.info(f"Extracting {zip_path.name} to {extract_dir}")
+            _extract_archive(zip_ref, extract_dir)
+    except Exception as e:
+        return zip_path, repr(e)
+    return zip_path, None
+
+def _extract_archive(zip_ref: zipfile.ZipFile, extract_dir: Path):
+    """Extracts every member of an open archive into `extract_dir`."""
+    infolist = zip_ref.infolist()
+    if len(infolist) <= 2:
+        for member in infolist:
+            _extract_member(zip_ref, member, extract_dir)
+        return
+    # Reads from the archive are serialized, but zlib releases the GIL while
+    # inflating, so members can be decompressed in parallel threads.
+    # Create the parent directories up front, extracting members races on them.
+    for parent in {_member_path(extract_dir, f.filename).parent for f in infolist if not f.is_dir()}:
+        parent.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=min(8, len(infolist))) as pool:
+        list(pool.map(lambda member: _extract_member(zip_ref, member, extract_dir), infolist))
+
+def disk_cache(ttl_days: float = 7, per_campaign: bool = False, load=None):
+    """
+    Caches the JSON-serializable result of a `UavsarDownloader` method under
+    `base_work_dir/.cache`, so later runs can skip the ASF round-trip.
+
+    Campaign metadata effectively never changes, so entries stay valid for `ttl_days`,
+    judged by the cache file's mtime. Empty results, or results containing None, are
+    treated as failed lookups and not cached. Set `use_cache = False` on the instance to
+    ignore cached entries and fetch fresh ones.
+
+    Args:
+        ttl_days (float, optional): How long a cached result stays valid. Defaults to 7.
+        per_campaign (bool, optional): If True, results are cached separately for each
+                                       campaign. Defaults to False.
+        load (callable, optional): Converts the loaded JSON value back, e.g. `tuple`.
+    """
+    def decorator(method):
+        key = method.__name__.removeprefix('get_')
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            name = f"{key}_{self.work_dir.name}" if per_campaign else key
+            cache_file = self.base_work_dir / '.cache' / f"{name}.json"
+            if self.use_cache:
+                try:
+                    if time.time() - cache_file.stat().st_mtime <= ttl_days * 24 * 60 * 60:
+                        value = json.loads(cache_file.read_text())
+                        return load(value) if load else value
+                except (OSError, ValueError):
+                    pass  # Missing or corrupt cache, fetch below
+
+            value = method(self, *args, **kwargs)
+            if value and all(v is not None for v in value):
+                try:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    cache_file.write_text(json.dumps(value))
+                except OSError as e:
+                    logging.debug(f"Could not write cache file {cache_file}: {e}")
+            return value
+        return wrapper
+    return decorator
+
 class UavsarDownloader:
     """
     A class to search, download, and process UAVSAR GRD data from the ASF
     data center for any specified campaign.
     """
 
-    def __init__(self, work_dir=None, skip_auth=False):
+    def __init__(self, work_dir=None, skip_auth=False, refresh_auth=False, download_workers=4, download_scenes=4):
         """
         Initializes the UavsarDownloader.
 
@@ -35,11 +396,25 @@ class UavsarDownloader:
                                       processed files. Defaults to '~/uavsar_data'.
             skip_auth (bool, optional): If True, skips authentication. Useful for
                                         local processing only. Defaults to False.
+            refresh_auth (bool, optional): If True, discards the login cookies saved by
+                                           a previous run and logs in again. Defaults to False.
+            download_workers (int, optional): The number of files of a scene to download
+                                              concurrently. Defaults to 4.
+            download_scenes (int, optional): The number of scenes the caller downloads
+                                             concurrently, used to size the connection
+                                             pool. Defaults to 4.
         """
         self.session = None
+        self.download_workers = download_workers
+        # Campaign metadata lookups are cached on disk, see `disk_cache`.
+        self.use_cache = True
         if not skip_auth:
             self._setup_auth()
-            self.session = asf_search.ASFSession()
+            self.session = self._create_session(pool_size=download_scenes * download_workers)
+            if refresh_auth:
+                AUTH_CACHE_FILE.unlink(missing_ok=True)
+            else:
+                self._load_auth_cache()
 
         if work_dir:
             self.base_work_dir = Path(work_dir).resolve()
@@ -79,6 +454,71 @@ class UavsarDownloader:
         os.chmod(netrc_path, 0o600)
         logging.info(f"Successfully created .netrc file at {netrc_path}")
 
+    @staticmethod
+    def _create_session(pool_size: int = 16) -> asf_search.ASFSession:
+        """
+        Creates the ASF session used for all searches and downloads. Its connection pool
+        lets requests reuse TLS connections, and transient server errors are retried.
+
+        Args:
+            pool_size (int, optional): The number of connections kept open per host. Streams
+                                       beyond it open a fresh TLS connection each time, so it
+                                       should cover every concurrent download. Defaults to 16.
+        """
+        session = asf_search.ASFSession()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=max(16, pool_size),
+            max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        session.mount('https://', adapter)
+        return session
+
+    def _load_auth_cache(self):
+        """Restores the Earthdata login cookies saved by a previous run, skipping any that have expired."""
+        try:
+            cookies = json.loads(AUTH_CACHE_FILE.read_text())
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        restored = 0
+        for cookie in cookies:
+            if cookie.get('expires', 0) > now:
+                self.session.cookies.set_cookie(create_cookie(**cookie))
+                restored += 1
+        if restored:
+            logging.info("Reusing saved Earthdata login session.")
+
+    def save_auth_cache(self):
+        """
+        Saves the session's persistent login cookies, so that the next run doesn't have to
+        go through the Earthdata login redirects again. Only the current user can read the file.
+        """
+        if not self.session:
+            return
+
+        # Session-only cookies have no expiry and must not outlive this run
+        cookies = [
+            {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+             'expires': c.expires, 'secure': c.secure}
+            for c in self.session.cookies if c.expires and not c.is_expired()
+        ]
+        if not cookies:
+            return
+        try:
+            AUTH_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(AUTH_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cookies, f)
+        except OSError as e:
+            logging.warning(f"Could not save login session to {AUTH_CACHE_FILE}: {e}")
+
+    def _search_options(self):
+        """Returns search options that send ASF searches through the shared session, if there is one."""
+        return asf_search.ASFSearchOptions(session=self.session) if self.session else None
+
+    @disk_cache()
     def get_available_campaigns(self):
         """Fetches a list of available UAVSAR campaigns from ASF."""
         logging.info("Fetching available UAVSAR campaigns...")
@@ -95,11 +535,12 @@ class UavsarDownloader:
         """Sets the campaign for the downloader and updates the working directory."""
         self.campaign = campaign
         # Sanitize the campaign name to make it a valid directory name
-        sanitized_campaign_name = re.sub(r'[^\w\s-]', '', campaign).strip().replace(' ', '_')
+        sanitized_campaign_name = _CAMPAIGN_SANITIZER.sub('', campaign).strip().replace(' ', '_')
         self.work_dir = self.base_work_dir / sanitized_campaign_name
         self.work_dir.mkdir(exist_ok=True)
         logging.info(f"Campaign set. Files will be stored in: {self.work_dir}")
 
+    @disk_cache(per_campaign=True, load=tuple)
     def get_campaign_date_range(self):
         """
         Fetches the start and end dates for the currently set campaign by searching
@@ -115,17 +556,19 @@ class UavsarDownloader:
             results = asf_search.search(
                 platform=asf_search.PLATFORM.UAVSAR,
                 campaign=self.campaign,
+                opts=self._search_options(),
             )
             
             if not results:
                 logging.warning(f"No products found for campaign '{self.campaign}' to determine date range.")
                 return None, None
 
-            all_start_times = [pd.to_datetime(p.properties['startTime']) for p in results]
-            all_stop_times = [pd.to_datetime(p.properties['stopTime']) for p in results]
+            # Parse all timestamps in one vectorized call rather than one call per product.
+            start_times = pd.to_datetime([p.properties['startTime'] for p in results], format='ISO8601', utc=True)
+            stop_times = pd.to_datetime([p.properties['stopTime'] for p in results], format='ISO8601', utc=True)
 
-            start_date = min(all_start_times).strftime('%Y-%m-%d')
-            end_date = max(all_stop_times).strftime('%Y-%m-%d')
+            start_date = start_times.min().strftime('%Y-%m-%d')
+            end_date = stop_times.max().strftime('%Y-%m-%d')
             
             logging.info(f"Date range for {self.campaign}: {start_date} to {end_date}")
             return start_date, end_date
@@ -152,6 +595,7 @@ class UavsarDownloader:
                 processingLevel=processing_levels,
                 start=start_date,
                 end=end_date,
+                opts=self._search_options(),
             )
             logging.info(f"Found {len(self.search_results)} products.")
             return self.search_results
@@ -161,10 +605,31 @@ class UavsarDownloader:
             self.search_results = asf_search.ASFSearchResults([])
             return self.search_results
 
-    def download_product(self, products_for_scene: list):
+    @staticmethod
+    def download_progress() -> Progress:
+        """Creates the rich progress display used for file downloads."""
+        return Progress(
+            TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
+            BarColumn(bar_width=None),
+            "[progress.percentage]{task.percentage:>3.1f}%",
+            "•",
+            TransferSpeedColumn(),
+            "•",
+            TimeRemainingColumn(),
+        )
+
+    def download_product(self, products_for_scene: list, progress: Progress = None, keep_zip: bool = True):
         """
         Downloads all selected files for a given scene.
 
+        Args:
+            products_for_scene (list): The ASF products selected for a single scene.
+            progress (Progress, optional): A running progress display to report to. Useful
+                                           when several scenes are downloaded concurrently,
+                                           since rich allows only one live display at a time.
+            keep_zip (bool, optional): If False, each archive is extracted as it arrives and
+                                       never written to the product directory. Defaults to True.
+
         Returns:
             A tuple of (Path, str) for the product directory and base name, or (None, None) on download failure.
         """
@@ -189,50 +654,27 @@ class UavsarDownloader:
             filename = url.split('/')[-1]
             # Download and stage inside the product-specific directory
             staging_path = product_dir / filename
-            
+            if not keep_zip and filename.endswith('.zip'):
+                staging_path = staging_path.with_suffix('')
+
             if staging_path.exists():
-                logging.info(f"Zip file {filename} already exists. Skipping download.")
+                logging.info(f"{staging_path.name} already exists. Skipping download.")
                 downloaded_files.append(staging_path)
                 continue
                 
             final_urls_to_download.append(url)
 
-        with Progress(
-            TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
-            BarColumn(bar_width=None),
-            "[progress.percentage]{task.percentage:>3.1f}%",
-            "•",
-            TransferSpeedColumn(),
-            "•",
-            TimeRemainingColumn(),
-        ) as progress:
+        with nullcontext(progress) if progress else self.download_progress() as progress:
             if final_urls_to_download:
                 logging.info(f"Downloading {len(final_urls_to_download)} file(s) for {base_name}...")
-                for url in final_urls_to_download:
-                    filename = url.split('/')[-1]
-                    # Download directly into the product directory
-                    staging_path = product_dir / filename
-                    task_id = progress.add_task("download", filename=filename, start=False)
-                    try:
-                        # Use the authenticated session to stream the download
-                        response = self.session.get(url, stream=True, timeout=120)
-                        response.raise_for_status()
-                        
-                        total_size = int(response.headers.get('content-length', 0))
-                        progress.update(task_id, total=total_size)
-                        progress.start_task(task_id)
-                        
-                        with open(staging_path, 'wb') as f:
-                            for chunk in response.iter_content(chunk_size=8192):
-                                f.write(chunk)
-                                progress.update(task_id, advance=len(chunk))
-                        
-                        downloaded_files.append(staging_path)
-                    except Exception as e:
-                        logging.error(f"Failed to download {filename}: {e}")
-                        progress.update(task_id, description=f"[bold red]Failed: {filename}[/bold red]")
-                        if staging_path.exists():
-                            staging_path.unlink(missing_ok=True)
+                # Each file is its own HTTPS stream, so fetching them together uses more of
+                # the available bandwidth than a single stream does.
+                with ThreadPoolExecutor(max_workers=min(self.download_workers, len(final_urls_to_download))) as ex:
+                    futures = [ex.submit(self._download_one, url, product_dir, progress, keep_zip) for url in final_urls_to_download]
+                    for future in as_completed(futures):
+                        staging_path = future.result()
+                        if staging_path:
+                            downloaded_files.append(staging_path)
 
         if not downloaded_files:
             logging.warning(f"No .zip files were downloaded or found for product {product_name}.")
@@ -240,76 +682,178 @@ class UavsarDownloader:
 
         return product_dir, base_name
     
-    def _unzip_with_progress(self, zip_path: Path, extract_dir: Path, progress: Progress):
-        """Unzips a file while updating a rich progress bar."""
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            infolist = zip_ref.infolist()
-            if not infolist: return
+    def _download_one(self, url: str, product_dir: Path, progress: Progress, keep_zip: bool = True) -> Path | None:
+        """
+        Streams a single file into the product directory, reporting to its own progress task.
 
-            # Check if all files from the zip exist in the target directory
-            if all((extract_dir / f.filename).exists() for f in infolist):
-                logging.info(f"Contents of {zip_path.name} already exist. Skipping unzip.")
-                return
+        Args:
+            url (str): The URL of the file to download.
+            product_dir (Path): The directory to download the file into.
+            progress (Progress): The running progress display.
+            keep_zip (bool, optional): If False, a zip archive is spooled to a temporary file
+                                       and extracted straight away instead of being saved.
 
-            logging.info(f"Extracting {zip_path.name} to {extract_dir}")
-            task_id = progress.add_task("unzip", filename=f"Unzipping {zip_path.name}", total=len(infolist))
-            for member in infolist:
-                zip_ref.extract(member, extract_dir)
-                progress.update(task_id, advance=1)
+        Returns:
+            The path of the downloaded file (or its extract directory), or None if the
+            download failed.
+        """
+        filename = url.split('/')[-1]
+        if not keep_zip and filename.endswith('.zip'):
+            return self._download_and_extract(url, product_dir, progress)
+        # Download directly into the product directory
+        staging_path = product_dir / filename
+        task_id = progress.add_task("download", filename=filename, start=False)
+        try:
+            # Use the authenticated session to stream the download
+            response = self.session.get(url, stream=True, timeout=120)
+            response.raise_for_status()
+
+            total_size = int(response.headers.get('content-length', 0))
+            progress.update(task_id, total=total_size)
+            progress.start_task(task_id)
+
+            with open(staging_path, 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    progress.update(task_id, advance=len(chunk))
 
-    def unzip_files(self, zip_paths: list[Path]):
+            return staging_path
+        except Exception as e:
+            logging.error(f"Failed to download {filename}: {e}")
+            progress.update(task_id, description=f"[bold red]Failed: {filename}[/bold red]")
+            if staging_path.exists():
+                staging_path.unlink(missing_ok=True)
+            return None
+
+    def _download_and_extract(self, url: str, product_dir: Path, progress: Progress) -> Path | None:
+        """
+        Streams a zip archive into a temporary buffer and extracts it from there.
+
+        Archives up to SPOOL_MAX_SIZE are held in memory and never touch the disk. Larger ones,
+        or ones of unknown size, go to an anonymous temporary file in the product directory
+        that disappears once extracted. Members are extracted into a
+        `.partial` directory that is renamed when done, so an existing extract directory is
+        always complete.
+
+        Returns:
+            The extract directory, or None if the download or extraction failed.
+        """
+        filename = url.split('/')[-1]
+        extract_dir = product_dir / Path(filename).stem
+        partial_dir = extract_dir.with_name(extract_dir.name + '.partial')
+        task_id = progress.add_task("download", filename=filename, start=False)
+        try:
+            response = self.session.get(url, stream=True, timeout=120)
+            response.raise_for_status()
+
+            total_size = int(response.headers.get('content-length', 0))
+            progress.update(task_id, total=total_size)
+            progress.start_task(task_id)
+
+            # Not SpooledTemporaryFile: ZipFile needs seekable(), which it only has since 3.11
+            in_memory = 0 < total_size <= SPOOL_MAX_SIZE
+            with io.BytesIO() if in_memory else tempfile.TemporaryFile(dir=product_dir) as buf:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    buf.write(chunk)
+                    progress.update(task_id, advance=len(chunk))
+                buf.seek(0)
+                shutil.rmtree(partial_dir, ignore_errors=True)
+                with zipfile.ZipFile(buf) as zip_ref:
+                    _extract_archive(zip_ref, partial_dir)
+            partial_dir.rename(extract_dir)
+            return extract_dir
+        except Exception as e:
+            logging.error(f"Failed to download and extract {filename}: {e}")
+            progress.update(task_id, description=f"[bold red]Failed: {filename}[/bold red]")
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            return None
+
+    def unzip_files(self, zip_paths: list[Path], max_workers: int = None, force: bool = False):
         """
         Unzips a list of provided zip files into new subdirectories named after each zip file.
+
+        Decompression is CPU-bound, so archives are extracted in parallel worker processes.
+        Archives whose contents are already extracted are skipped.
+
+        Args:
+            zip_paths (list[Path]): The archives to extract.
+            max_workers (int, optional): The number of worker processes. Defaults to the
+                                         number of CPUs.
+            force (bool, optional): If True, extracts archives again even if their
+                                    contents already exist. Defaults to False.
         """
         if not zip_paths:
             logging.warning("No .zip files provided for unzipping.")
             return
 
+        if not force:
+            pending = [zip_path for zip_path in zip_paths if not _already_extracted(zip_path)]
+            if len(pending) < len(zip_paths):
+                logging.info(f"Skipping {len(zip_paths) - len(pending)} archive(s) that are already extracted.")
+            zip_paths = pending
+            if not zip_paths:
+                return
+
         with Progress(
             TextColumn("[bold blue]{task.fields[filename]}", justify="right"),
             BarColumn(bar_width=None),
             "[progress.percentage]{task.percentage:>3.1f}%",
-        ) as progress:
-            for zip_path in zip_paths:
-                # The zip file is inside the product directory, so we extract to its parent.
-                extract_dir = zip_path.parent / zip_path.stem
-                extract_dir.mkdir(exist_ok=True)
-                self._unzip_with_progress(zip_path, extract_dir, progress)
-    @staticmethod
-    def _get_encapsulated(str_line, encapsulator):
-        """Helper to find text within encapsulators (e.g., parentheses)."""
-        result = []
-        if len(encapsulator) > 2:
-            raise ValueError('encapsulator can only be 1 or 2 chars long!')
-        lcap, rcap = (encapsulator[0], encapsulator[1]) if len(encapsulator) == 2 else (encapsulator, encapsulator)
-        
-        if lcap in str_line:
-            for i, val in enumerate(str_line.split(lcap)):
-                if i != 0:
-                    result.append(val[0:val.index(rcap)])
-        return result
+        ) as progress, ProcessPoolExecutor(max_workers=max_workers, mp_context=MP_CONTEXT) as executor:
+            task_id = progress.add_task("unzip", filename="Unzipping archives", total=len(zip_paths))
+            futures = [executor.submit(_unzip_one, zip_path) for zip_path in zip_paths]
+            for future in as_completed(futures):
+                zip_path, error = future.result()
+                if error:
+                    logging.error(f"Failed to unzip {zip_path.name}: {error}")
+                progress.advance(task_id)
 
     @staticmethod
     def _read_annotation(ann_file: Path) -> dict:
         """
         Parses a UAVSAR annotation file into a structured dictionary.
+
+        The parsed dictionary is cached next to the file as `<name>.ann.v<N>.json` and reused
+        while the cache is at least as new as the annotation file. N is _ANN_CACHE_VERSION,
+        so caches written by an older parser are ignored. The cache is JSON rather than a
+        pickle: it sits in a shared data directory, and loading a pickle would run whatever
+        code its writer put into it.
+        """
+        cache_file = ann_file.with_name(f"{ann_file.name}.v{_ANN_CACHE_VERSION}.json")
+        try:
+            if cache_file.stat().st_mtime >= ann_file.stat().st_mtime:
+                with open(cache_file) as fp:
+                    return json.load(fp, object_hook=_ann_cache_decode)
+        except (OSError, ValueError):
+            pass  # Missing, stale or unreadable cache, parse below
+
+        data = UavsarDownloader._parse_annotation(ann_file)
+        try:
+            # Write to a temporary file first, so a reader never sees a partial cache
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w') as fp:
+                json.dump(data, fp, default=_ann_cache_encode)
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError) as e:
+            logging.debug(f"Could not write annotation cache {cache_file}: {e}")
+        return data
+
+    @staticmethod
+    def _parse_annotation(ann_file: Path) -> dict:
+        """
+        Parses a UAVSAR annotation file into a structured dictionary.
         Logic adapted from the uavsar_pytools library.
         """
-        with open(ann_file) as fp:
-            lines = fp.readlines()
         data = {}
-
-        for line in lines:
-            info = line.strip().split(';')
-            comment = info[-1].strip().lower()
-            info = info[0]
-            if info and "=" in info:
-                d = info.split('=')
-                name, value = d[0], d[1]
-                key = name.split('(')[0].strip().lower()
-                units = UavsarDownloader._get_encapsulated(name, '()')
-                units = units[0] if units else None
-                value = value.strip()
+        with open(ann_file) as fp:
+            for line in fp:
+                if line.startswith(';'):
+                    continue  # Comment-only lines are common, skip them without matching
+                m = _ANN_LINE.match(line)
+                if not m:
+                    continue  # Blank, indented comment or malformed line
+                key, units, value, comment = m.group('key', 'units', 'value', 'comment')
+                key, value = key.lower(), value.strip()
+                comment = comment.strip().lower() if comment else ''
 
                 # Attempt to convert value to a numeric type (int or float)
                 try:
@@ -330,55 +874,102 @@ class UavsarDownloader:
                 key = f'{timing} time of acquisition'
                 if key in data:
                     dt = pd.to_datetime(data[key]['value'])
-                    dt = dt.astimezone(pytz.timezone('US/Mountain'))
+                    dt = dt.astimezone(_ANN_TIMEZONE)
                     data[key]['value'] = dt
         return data
     
-    def process_product_directory(self, product_dir: Path):
+    def process_product_directory(
+        self, product_dir: Path, max_workers: int = None, num_threads='ALL_CPUS', show_progress: bool = True
+    ):
         """
         Finds all convertible data files in a directory and processes them into GeoTIFFs.
 
+        Each file is converted independently, so they are spread across worker processes.
+
         Args:
             product_dir (Path): The path to the directory containing the unzipped product files.
+            max_workers (int, optional): The number of worker processes. Pass 1 to convert the
+                                         files one after another in this process. Defaults to
+                                         the number of CPUs.
+            num_threads (int | str, optional): The number of threads each file is compressed
+                                               with when converting in this process. Pass 1
+                                               when several directories are converted at once.
+                                               Defaults to 'ALL_CPUS'.
+            show_progress (bool, optional): If False, no progress bar is drawn, e.g. when several
+                                            directories are converted at once. Defaults to True.
         """
         logging.info(f"Processing all convertible files in: {product_dir}")
 
+        # List the directory once; the annotation, the inputs and finished outputs all come from it.
+        names = sorted(entry.name for entry in os.scandir(product_dir) if entry.is_file())
+
         # 1. Find and parse the annotation file, which contains metadata for all other files.
-        try:
-            ann_file = next(product_dir.glob('*.ann'))
-            logging.info(f"Found annotation file: {ann_file.name}")
-        except StopIteration:
+        ann_file = next((product_dir / name for name in names if name.endswith('.ann')), None)
+        if ann_file is None:
             logging.error(f"No .ann file found in {product_dir}. Cannot process files.")
             return
+        logging.info(f"Found annotation file: {ann_file.name}")
 
         ann_data = self._read_annotation(ann_file)
         if not ann_data:
             logging.error(f"Failed to parse annotation file: {ann_file.name}")
             return
 
+        # Index the metadata blocks once for all files
+        ann_index = _index_annotation(ann_data)
+
         # 2. Find all relevant data files to convert
         files_to_convert = [
-            f for f in product_dir.iterdir() 
-            if f.suffix.lower() in ['.grd', '.slc', '.mlc', '.inc', '.hgt', '.slope', '.dem', '.amp', '.cor', '.unw']
+            product_dir / name for name in names
+            if Path(name).suffix.lower() in ['.grd', '.slc', '.mlc', '.inc', '.hgt', '.slope', '.dem', '.amp', '.cor', '.unw']
         ]
 
         if not files_to_convert:
             logging.info("No convertible files found in product directory.")
             return
 
+        # Skip files that are already converted here, rather than sending them to a worker to find out
+        existing = set(names)
+        pending = [f for f in files_to_convert if f"{f.name}.tiff" not in existing]
+        if len(pending) < len(files_to_convert):
+            logging.info(f"Skipping {len(files_to_convert) - len(pending)} file(s) that are already converted.")
+        files_to_convert = pending
+        if not files_to_convert:
+            return
+
         # 3. Convert files with a progress bar
         with Progress(
             TextColumn("[bold green]{task.description}"),
             BarColumn(),
             "[progress.percentage]{task.percentage:>3.0f}%",
-            "({task.completed} of {task.total})"
+            "({task.completed} of {task.total})",
+            disable=not show_progress,
         ) as progress:
             task = progress.add_task("Converting to GeoTIFF...", total=len(files_to_convert))
-            for data_file in files_to_convert:
-                self._convert_file_to_geotiff(data_file, ann_data)
-                progress.advance(task)
+            if len(files_to_convert) == 1 or max_workers == 1:
+                for data_file in files_to_convert:
+                    try:
+                        self._convert_file_to_geotiff(data_file, ann_data, num_threads, ann_index)
+                    except Exception as e:
+                        logging.error(f"Failed to convert {data_file.name}: {e}")
+                    progress.advance(task)
+                return
+
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=MP_CONTEXT) as executor:
+                futures = {
+                    # Each worker compresses on one thread, the pool already uses every CPU
+                    executor.submit(UavsarDownloader._convert_file_to_geotiff, data_file, ann_data, 1, ann_index): data_file
+                    for data_file in files_to_convert
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logging.error(f"Failed to convert {futures[future].name}: {e}")
+                    progress.advance(task)
     
-    def _get_band_metadata(self, in_fp: Path, ann_data: dict) -> dict | None:
+    @staticmethod
+    def _get_band_metadata(in_fp: Path, ann_data: dict, ann_index: dict = None) -> dict | None:
         """
         Parses annotation data to get all required metadata for a given band file.
         Logic adapted from the uavsar_pytools library.
@@ -386,7 +977,12 @@ class UavsarDownloader:
         Args:
             in_fp (Path): Path to the input binary data file (e.g., .grd, .inc).
             ann_data (dict): Parsed annotation data from _read_annotation.
+            ann_index (dict, optional): The index of `ann_data` from _index_annotation.
+                                        Built here if not given.
         """
+        if ann_index is None:
+            ann_index = _index_annotation(ann_data)
+        has_rows = ann_index.get('set_rows', frozenset())
         file_type = in_fp.suffix.lstrip('.')
         fname = in_fp.stem
         
@@ -397,7 +993,7 @@ class UavsarDownloader:
             # We create a fallback chain to find dimensions from a related layer.
             fallback_keys = [file_type, 'hgt', 'grd_pwr']
             for key in fallback_keys:
-                if f'{key}.set_rows' in ann_data:
+                if key in has_rows:
                     search_key_prefix = key
                     logging.debug(f"For file type '{file_type}', using metadata from '{key}' block.")
                     break
@@ -407,7 +1003,7 @@ class UavsarDownloader:
             for suffix in ['_pwr', '_mag', '_phase', '']:
                 # For grd, the key might be grd_pwr. For slc, it might be slc_mag.
                 test_key = f"{file_type}{suffix}".strip('_') if suffix else file_type
-                if f"{test_key}.set_rows" in ann_data:
+                if test_key in has_rows:
                     search_key_prefix = test_key
                     break
 
@@ -420,28 +1016,20 @@ class UavsarDownloader:
             cols = ann_data[f'{search_key_prefix}.set_cols']['value']
 
             # Determine data type from annotation file, not filename heuristics
-            val_frmt = ann_data.get(f'{search_key_prefix}.val_frmt', {}).get('value', '').upper()
+            val_frmt = str(ann_data.get(f'{search_key_prefix}.val_frmt', {}).get('value', '')).upper()
             is_complex_from_meta = 'COMPLEX' in val_frmt
-            
-            if 'REAL*4' in val_frmt or 'REAL' in val_frmt:
-                dtype = np.float32
-            elif 'REAL*8' in val_frmt: # For robustness
-                dtype = np.float64
-            elif is_complex_from_meta:
-                dtype = np.complex64
-            else:
-                # Fallback for formats like .inc, .hgt that might not have val_frmt
-                dtype = np.float32
+            # Fallback for formats like .inc, .hgt that might not have val_frmt
+            dtype = _FMT_TO_DTYPE.get(val_frmt, _FMT_TO_DTYPE['COMPLEX*8' if is_complex_from_meta else 'REAL*4'])
 
             # Override for GRD cross-products which are complex, even if the base metadata (grd_pwr) is for a real type.
             if file_type == 'grd':
                 # Extract polarization from filename, e.g., HHHV, HVHV, etc.
-                pol_match = re.search(r'L\d{3}([HV]{4})_CX', fname)
+                pol_match = _GRD_POL_RE.search(fname)
                 if pol_match:
                     polarization = pol_match.group(1)
                     # Co-pol power products are real. Cross-pol products are complex.
-                    if polarization not in ['HHHH', 'VVVV', 'HVHV', 'VHVH']:
-                        dtype = np.complex64
+                    if polarization not in _COPOL:
+                        dtype = _FMT_TO_DTYPE['COMPLEX*8']
                         is_complex = True
                     else:
                         is_complex = False # It's a real power image
@@ -449,6 +1037,10 @@ class UavsarDownloader:
                     is_complex = is_complex_from_meta
             else:
                 is_complex = is_complex_from_meta
+
+            # UAVSAR data is little-endian, but follow the annotation if it says otherwise
+            if 'BIG' in str(ann_data.get(f'{search_key_prefix}.val_endi', {}).get('value', '')).upper():
+                dtype = dtype.newbyteorder('>')
             
             # Get nodata value from annotation, with a fallback default.
             nodata_key = f'{search_key_prefix}.no_data'
@@ -463,6 +1055,13 @@ class UavsarDownloader:
                 else:
                     # For power/magnitude images (grd, slc, mlc), 0.0 is a common no-data value.
                     nodata_value = 0.0 
+
+            # Integer rasters can't hold a nodata value outside their range (or a fraction)
+            if np.issubdtype(dtype, np.integer) and nodata_value is not None:
+                info = np.iinfo(dtype)
+                if not (info.min <= nodata_value <= info.max and float(nodata_value).is_integer()):
+                    logging.debug(f"No-data value {nodata_value} does not fit {dtype}; writing {in_fp.name} without one.")
+                    nodata_value = None
             
             transform = None
             crs = None
@@ -472,8 +1071,9 @@ class UavsarDownloader:
             utm_geo_prefix = None
             # Expand fallback to include common geo-data sources
             geo_fallback_keys = [search_key_prefix, 'grd_pwr', 'hgt', file_type]
+            has_easting = ann_index.get('upper_left_easting', frozenset())
             for p in geo_fallback_keys:
-                if f'{p}.upper_left_easting' in ann_data:
+                if p in has_easting:
                     utm_geo_prefix = p
                     break
             
@@ -493,10 +1093,10 @@ class UavsarDownloader:
                 # Attempt to find EQA (lat/lon) projection info
                 eqa_geo_prefix = None
                 # Use the same expanded fallback for EQA
+                has_row_addr = ann_index.get('row_addr', frozenset())
                 for p in geo_fallback_keys:
                     # EQA uses 'row_addr' with 'deg' units for lat
-                    key = f'{p}.row_addr'
-                    if key in ann_data and ann_data[key].get('units') == 'deg':
+                    if p in has_row_addr and ann_data[f'{p}.row_addr'].get('units') == 'deg':
                         eqa_geo_prefix = p
                         break
                 
@@ -507,7 +1107,7 @@ class UavsarDownloader:
                     lat_ps = ann_data[f'{eqa_geo_prefix}.row_mult']['value']
                     lon_ps = ann_data[f'{eqa_geo_prefix}.col_mult']['value']
 
-                    crs = CRS.from_epsg(4326) # WGS 84
+                    crs = _WGS84
                     transform = Affine(lon_ps, 0, ul_lon, 0, lat_ps, ul_lat)
 
             if not transform:
@@ -523,114 +1123,212 @@ class UavsarDownloader:
             logging.error(f"Missing required metadata key {e} for '{search_key_prefix}' in annotation file.")
             return None
 
-    def _convert_file_to_geotiff(self, in_fp: Path, ann_data: dict):
+    @staticmethod
+    def read_band_array(in_fp: Path, ann_data: dict, mode: str = 'r') -> np.memmap:
+        """
+        Memory-maps a UAVSAR binary file as a 2D array, without converting it to a GeoTIFF.
+
+        Pages are read from disk on first access, so this is cheap even for multi-GB files.
+        Values are in the file's own dtype and byte order, and complex data stays complex.
+
+        Args:
+            in_fp (Path): Path to the binary data file (e.g., .grd, .inc).
+            ann_data (dict): Parsed annotation data from _read_annotation.
+            mode (str, optional): The np.memmap mode. With 'r+', writes to the array change
+                                  the file on disk. Defaults to 'r'.
+
+        Raises:
+            ValueError: If the annotation has no metadata for the file, or its size does not
+                        match the annotated dimensions.
+        """
+        metadata = UavsarDownloader._get_band_metadata(in_fp, ann_data)
+        if not metadata:
+            raise ValueError(f"No metadata for {in_fp.name} in the annotation file.")
+        rows, cols, dtype = metadata['rows'], metadata['cols'], np.dtype(metadata['dtype'])
+        actual_size = in_fp.stat().st_size
+        if actual_size != rows * cols * dtype.itemsize:
+            raise ValueError(f"{in_fp.name} is {actual_size} bytes, expected {rows * cols * dtype.itemsize} for {rows}x{cols} {dtype}")
+        return np.memmap(in_fp, dtype=dtype, mode=mode, shape=(rows, cols))
+
+    @staticmethod
+    def _convert_file_to_geotiff(in_fp: Path, ann_data: dict, num_threads='ALL_CPUS', ann_index: dict = None):
         """ 
         Converts a single UAVSAR binary file to a GeoTIFF using its annotation metadata.
 
         Args:
             in_fp (Path): Path to the input binary data file (e.g., .grd, .inc).
             ann_data (dict): Parsed annotation data from _read_annotation.
+            num_threads (int | str, optional): The number of threads GDAL compresses tiles
+                                               with. Defaults to 'ALL_CPUS'.
+            ann_index (dict, optional): The index of `ann_data` from _index_annotation.
         """
         out_fp = in_fp.with_suffix(in_fp.suffix + '.tiff')
         if out_fp.exists():
             logging.info(f"Output file {out_fp.name} already exists. Skipping conversion.")
             return
 
-        metadata = self._get_band_metadata(in_fp, ann_data)
+        metadata = UavsarDownloader._get_band_metadata(in_fp, ann_data, ann_index)
         if not metadata:
             logging.warning(f"Could not get metadata for {in_fp.name}. Skipping conversion.")
             return
 
         logging.info(f"Converting {in_fp.name} using metadata key prefix: '{metadata['search_key_prefix']}'")
 
+        rows, cols = metadata['rows'], metadata['cols']
+        dtype = np.dtype(metadata['dtype'])
         try: # This try block should use the dtype determined above
-            data = np.fromfile(in_fp, dtype=metadata['dtype'])
-            if metadata['is_complex']:
-                data = np.abs(data) # Convert complex to magnitude for visualization
-            data = data.reshape((metadata['rows'], metadata['cols']))
+            expected_size = rows * cols * dtype.itemsize
+            actual_size = in_fp.stat().st_size
+            if actual_size != expected_size:
+                raise ValueError(f"file is {actual_size} bytes, expected {expected_size} for {rows}x{cols} {dtype}")
         except Exception as e:
             logging.error(f"Failed to read or process binary data from {in_fp.name}: {e}")
             return
 
         profile = {
             'driver': 'GTiff',
-            'height': metadata['rows'],
-            'width': metadata['cols'],
+            'height': rows,
+            'width': cols,
             'count': 1,
-            'dtype': data.dtype,
+            # Complex data is written as its magnitude for visualization
+            'dtype': np.float32 if metadata['is_complex'] else dtype.newbyteorder('='),
             'crs': metadata['crs'],
             'transform': metadata['transform'],
-            'compress': 'lzw',
+            # ZSTD at level 1 writes several times faster than LZW, at a similar or better ratio
+            'compress': 'zstd',
+            'zstd_level': 1,
+            'num_threads': num_threads,
             'nodata': metadata['nodata_value'],
+            'tiled': True,
+            'blockxsize': CONVERT_BLOCK_SIZE,
+            'blockysize': CONVERT_BLOCK_SIZE,
+            'BIGTIFF': 'IF_SAFER',
         }
 
         logging.info(f"Writing GeoTIFF to {out_fp.name}")
-        with rasterio.open(out_fp, 'w', **profile) as dst:
-            dst.write(data, 1)
-        
+        mag = np.empty((CONVERT_BLOCK_SIZE, cols), dtype=np.float32) if metadata['is_complex'] else None
+        with _partial_output(out_fp) as partial_fp, rasterio.Env(**GDAL_CONFIG), rasterio.open(partial_fp, 'w', **profile) as dst:
+            # Each block covers one full row of tiles, so every tile is written exactly once.
+            for row0, block in _read_blocks(in_fp, dtype, rows, cols, CONVERT_BLOCK_SIZE):
+                if not dtype.isnative:
+                    # The buffer is re-read for the next block, so it can be swapped in place
+                    block = block.byteswap(inplace=True).view(dtype.newbyteorder('='))
+                if metadata['is_complex']:
+                    block = _magnitude(block, out=mag[:block.shape[0]])
+                dst.write(block, 1, window=Window(0, row0, cols, block.shape[0]))
+
         logging.info(f"Successfully created GeoTIFF: {out_fp.name}")
 
-    def stack_bands(self, product_dir: Path, tiff_paths: list[Path]):
+    def stack_bands(
+        self,
+        product_dir: Path,
+        tiff_paths: list[Path],
+        vrt: bool = False,
+        quantize: bool = False,
+        num_threads='ALL_CPUS',
+        show_progress: bool = True,
+    ):
         """
         Stacks a list of single-band GeoTIFFs into a single multi-band GeoTIFF.
+
+        Args:
+            product_dir (Path): The data directory holding the bands.
+            tiff_paths (list[Path]): The single-band GeoTIFFs to stack, in band order.
+            vrt (bool, optional): If True, writes a virtual stack (`.vrt`) that references the
+                                  bands instead of copying them. It is created instantly and
+                                  takes no space, but needs the band files to stay in place.
+                                  Defaults to False.
+            quantize (bool, optional): If True, writes an 8-bit preview stack
+                                       (`_stack_uint8.tif`) instead: each band is clipped to its
+                                       2nd-98th percentile and scaled to 1-255, with 0 as nodata.
+                                       It is a quarter of the size of a float32 stack but not
+                                       suitable for analysis. Defaults to False.
+            num_threads (int | str, optional): The number of threads the stack is compressed
+                                               with, which also caps the band reader threads.
+                                               Pass 1 when several stacks are written at once.
+                                               Defaults to 'ALL_CPUS'.
+            show_progress (bool, optional): If False, no progress bar is drawn, e.g. when several
+                                            stacks are written at once. Defaults to True.
         """
+        if vrt and quantize:
+            raise ValueError("A virtual stack cannot be quantized.")
         if not tiff_paths:
             logging.warning("No GeoTIFF files provided for stacking.")
             return
 
-        # 1. Read band data and get metadata from the first band
-        bands_data = []
-        band_names = []
-        first_band_profile = None
+        # The product_dir is the unzipped data folder (e.g., .../winnip_..._grd/)
+        # We want to save the stack in its parent (the main product folder)
+        suffix = '_uint8.tif' if quantize else '.vrt' if vrt else '.tif'
+        out_fp = product_dir.parent / f"{product_dir.parent.name}_stack{suffix}"
+        if out_fp.exists():
+            logging.info(f"Output stack file {out_fp.name} already exists. Skipping.")
+            return
 
-        with Progress(
-            TextColumn("[bold cyan]{task.description}"),
-            BarColumn(),
-            "({task.completed} of {task.total})"
-        ) as progress:
-            task = progress.add_task("Reading bands...", total=len(tiff_paths))
+        with _partial_output(out_fp) as partial_fp, ExitStack() as stack:
+            stack.enter_context(rasterio.Env(**GDAL_CONFIG))
+
+            # 1. Open every band and check that it matches the first one
+            srcs = []
             for tiff_path in tiff_paths:
                 try:
-                    with rasterio.open(tiff_path) as src:
-                        if not first_band_profile:
-                            first_band_profile = src.profile
-                            if src.count != 1:
-                                logging.error(f"Input file {tiff_path.name} is not a single-band GeoTIFF. Aborting stack.")
-                                return
-                        else:
-                            if (src.width != first_band_profile['width'] or
-                                src.height != first_band_profile['height'] or
-                                src.crs != first_band_profile['crs'] or
-                                src.transform != first_band_profile['transform']):
-                                logging.error(f"Dimension or CRS mismatch: {tiff_path.name} does not match the first band. Aborting stack.")
-                                return
-                        
-                        bands_data.append(src.read(1))
-                        band_names.append(tiff_path.stem)
-                        progress.advance(task)
-
+                    src = stack.enter_context(rasterio.open(tiff_path))
                 except Exception as e:
                     logging.error(f"Failed to read or process data from {tiff_path.name}: {e}")
                     return
-        
-        # 2. Create the output GeoTIFF
-        # The product_dir is the unzipped data folder (e.g., .../winnip_..._grd/)
-        # We want to save the stack in its parent (the main product folder)
-        out_fp = product_dir.parent / f"{product_dir.parent.name}_stack.tif"
-        if out_fp.exists():
-            logging.info(f"Output stack file {out_fp.name} already exists. Skipping.")
-            return
+                if src.count != 1:
+                    logging.error(f"Input file {tiff_path.name} is not a single-band GeoTIFF. Aborting stack.")
+                    return
+                if srcs and (src.width != srcs[0].width or src.height != srcs[0].height or
+                             src.crs != srcs[0].crs or src.transform != srcs[0].transform):
+                    logging.error(f"Dimension or CRS mismatch: {tiff_path.name} does not match the first band. Aborting stack.")
+                    return
+                srcs.append(src)
+
+            if vrt:
+                _write_vrt(partial_fp, srcs, [tiff_path.stem for tiff_path in tiff_paths])
+                logging.info(f"Successfully created virtual stack: {out_fp.name}")
+                return
+
+            # 2. Create the output GeoTIFF
+            output_profile = srcs[0].profile.copy()
+            output_profile['count'] = len(srcs)
+            output_profile['compress'] = 'zstd'
+            output_profile['zstd_level'] = 1
+            if quantize:
+                output_profile.update(dtype='uint8', nodata=0)
+                ranges = [_percentile_range(src) for src in srcs]
+            # Floating point and horizontal differencing predictors, respectively
+            output_profile['predictor'] = 3 if np.issubdtype(output_profile['dtype'], np.floating) else 2
+            output_profile.update(
+                tiled=True, blockxsize=CONVERT_BLOCK_SIZE, blockysize=CONVERT_BLOCK_SIZE,
+                num_threads=num_threads, BIGTIFF='IF_SAFER',
+            )
+
+            # 3. Copy the bands one window at a time, so only one block per band is in memory.
+            # Each band is read on its own thread; GDAL releases the GIL while decoding.
+            logging.info(f"Writing {len(srcs)}-band GeoTIFF to {out_fp.name}")
+            dst = stack.enter_context(rasterio.open(partial_fp, 'w', **output_profile))
+            windows = [window for _, window in dst.block_windows(1)]
+            read_threads = 8 if num_threads == 'ALL_CPUS' else int(num_threads)
+            pool = stack.enter_context(ThreadPoolExecutor(max_workers=min(read_threads, len(srcs))))
+            with Progress(
+                TextColumn("[bold cyan]{task.description}"),
+                BarColumn(),
+                "({task.completed} of {task.total})",
+                disable=not show_progress,
+            ) as progress:
+                task = progress.add_task("Stacking bands...", total=len(windows))
+                # Each band is read straight into its slice of one reused window buffer, so
+                # there are no per-band arrays and no copy to stack them.
+                n = len(srcs)
+                buf = np.empty(n * CONVERT_BLOCK_SIZE * CONVERT_BLOCK_SIZE, dtype=srcs[0].dtypes[0])
+                for window in windows:
+                    blocks = buf[:n * window.height * window.width].reshape(n, window.height, window.width)
+                    list(pool.map(lambda i: srcs[i].read(1, window=window, out=blocks[i]), range(n)))
+                    if quantize:
+                        blocks = np.stack([_quantize_to_uint8(block, *r, src.nodata) for block, r, src in zip(blocks, ranges, srcs)])
+                    dst.write(blocks, window=window)
+                    progress.advance(task)
+            dst.descriptions = tuple(tiff_path.stem for tiff_path in tiff_paths)
 
-        # Update the profile for the new multi-band file
-        output_profile = first_band_profile.copy()
-        output_profile['count'] = len(bands_data)
-        output_profile['compress'] = 'deflate'
-        output_profile['predictor'] = 3 # Predictor for floating point data
-        
-        logging.info(f"Writing {len(bands_data)}-band GeoTIFF to {out_fp.name}")
-        with rasterio.open(out_fp, 'w', **output_profile) as dst:
-            for i, (band_data, band_name) in enumerate(zip(bands_data, band_names), 1):
-                dst.write(band_data, i)
-                dst.set_band_description(i, band_name)
-        
         logging.info(f"Successfully created stacked GeoTIFF: {out_fp.name}")
\ No newline at end of file
@@ -0,0 +1,277 @@
+import pytest
+from uavsar.cli import (
+    SearchParams,
+    _download_all,
+    _find_data_dirs,
+    _held_logs,
+    _in_background,
+    _interactive_search_wizard,
+    _list_by_suffix,
+    _list_subdirs,
+    _run_in_processes,
+    _threads_per_task,
+)
+
+def test_find_data_dirs(tmp_path):
+    """Tests that only data directories directly inside product directories are found."""
+    for rel in ["prod_a/data_grd", "prod_b/data_grd", "prod_b/data_inc", "prod_b/data_grd/nested"]:
+        (tmp_path / rel).mkdir(parents=True)
+    (tmp_path / "prod_a/data_grd/a.ann").touch()
+    (tmp_path / "prod_b/data_grd/b.ann").touch()
+    (tmp_path / "prod_b/data_inc/b.inc").touch()
+    (tmp_path / "prod_b/data_grd/nested/c.ann").touch()
+    (tmp_path / "prod_a/top_level.ann").touch()
+
+    assert _find_data_dirs(str(tmp_path), ".ann") == (
+        tmp_path / "prod_a/data_grd",
+        tmp_path / "prod_b/data_grd",
+    )
+
+def test_list_subdirs(tmp_path):
+    """Tests that hidden directories are skipped and new directories invalidate the listing."""
+    (tmp_path / "Campaign_B").mkdir()
+    (tmp_path / "Campaign_A").mkdir()
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / "notes.txt").touch()
+    assert _list_subdirs(tmp_path) == (tmp_path / "Campaign_A", tmp_path / "Campaign_B")
+
+    (tmp_path / "Campaign_C").mkdir()
+    assert tmp_path / "Campaign_C" in _list_subdirs(tmp_path)
+
+def test_in_background():
+    """Tests that background results and errors are delivered through the returned future."""
+    assert _in_background(lambda a, b: a + b, 1, 2).result(timeout=5) == 3
+
+    def fail():
+        raise RuntimeError("lookup failed")
+    with pytest.raises(RuntimeError):
+        _in_background(fail).result(timeout=5)
+
+def test_list_by_suffix(tmp_path):
+    """Tests that only files with the suffix are listed, in name order."""
+    for name in ["b.grd.tiff", "a.inc.tiff", "a.grd", "c.tiff.aux.xml"]:
+        (tmp_path / name).touch()
+    (tmp_path / "folder.tiff").mkdir()
+
+    assert _list_by_suffix(tmp_path, ".tiff") == [tmp_path / "a.inc.tiff", tmp_path / "b.grd.tiff"]
+
+def test_search_wizard_without_prompts(tmp_path, monkeypatch):
+    """Tests that fully specified search parameters are used without prompting."""
+    import questionary
+
+    class Processor:
+        base_work_dir = tmp_path
+        work_dir = tmp_path / "Winnipeg_Canada"
+
+        def get_available_campaigns(self):
+            return ["Winnipeg, Canada"]
+
+        def set_campaign(self, name):
+            self.campaign = name
+
+        def get_campaign_date_range(self):
+            return ["2012-06-01", "2012-07-31"]
+
+    def no_prompt(*args, **kwargs):
+        raise AssertionError("unexpected prompt")
+
+    monkeypatch.setattr(questionary, "select", no_prompt)
+    monkeypatch.setattr(questionary, "checkbox", no_prompt)
+    monkeypatch.setattr(questionary, "text", no_prompt)
+
+    processor = Processor()
+    params = SearchParams("Winnipeg, Canada", ["GRD_HD"], "2012-06-05", "2012-06-20")
+    assert _interactive_search_wizard(processor, params) == params
+    assert processor.campaign == "Winnipeg, Canada"
+
+    # Without prompts, missing dates fall back to the campaign's date range.
+    params = _interactive_search_wizard(processor, SearchParams("Winnipeg, Canada", ["GRD_HD"]), prompt=False)
+    assert (params.start_date, params.end_date) == ("2012-06-01", "2012-07-31")
+
+    assert _interactive_search_wizard(processor, SearchParams("Nowhere", ["GRD_HD"]), prompt=False) is None
+
+def test_download_all_reports_failed_scenes(tmp_path, monkeypatch):
+    """Tests that scenes that fail or raise while downloading are reported by name."""
+    from uavsar.core import UavsarDownloader
+
+    def download_product(products, progress=None, keep_zip=True):
+        scene_name = products[0]
+        if scene_name == "scene_raises":
+            raise RuntimeError("connection reset")
+        if scene_name == "scene_missing":
+            return None, None
+        return tmp_path / scene_name, scene_name
+
+    processor = UavsarDownloader(work_dir=tmp_path, skip_auth=True)
+    monkeypatch.setattr(processor, "download_product", download_product)
+    scene_map = {name: [name] for name in ["scene_ok", "scene_raises", "scene_missing"]}
+
+    assert sorted(_download_all(scene_map, processor, max_workers=2)) == ["scene_missing", "scene_raises"]
+
+def test_download_all_unzips_finished_scenes(tmp_path, monkeypatch):
+    """Tests that each downloaded scene's archives are handed to the unzip executor."""
+    import zipfile
+    from concurrent.futures import ThreadPoolExecutor
+    from types import SimpleNamespace
+    from uavsar.core import UavsarDownloader
+
+    def download_product(products, progress=None, keep_zip=True):
+        product_dir = tmp_path / products[0].properties['sceneName']
+        product_dir.mkdir(exist_ok=True)
+        for p in products:
+            filename = p.properties['url'].split('/')[-1]
+            with zipfile.ZipFile(product_dir / filename, 'w') as zf:
+                zf.writestr("test.ann", filename)
+        return product_dir, product_dir.name
+
+    processor = UavsarDownloader(work_dir=tmp_path, skip_auth=True)
+    monkeypatch.setattr(processor, "download_product", download_product)
+    scene_map = {
+        scene: [SimpleNamespace(properties={'sceneName': scene, 'url': f"https://example.com/{scene}_{kind}.zip"})
+                for kind in ["grd", "inc"]]
+        for scene in ["scene_a", "scene_b"]
+    }
+
+    submitted = []
+    with ThreadPoolExecutor() as unzip_pool:
+        submit = unzip_pool.submit
+        monkeypatch.setattr(unzip_pool, "submit", lambda fn, path: submitted.append(path) or submit(fn, path))
+        assert _download_all(scene_map, processor, unzip_executor=unzip_pool) == []
+
+    assert len(submitted) == 4
+    for scene in scene_map:
+        for kind in ["grd", "inc"]:
+            assert (tmp_path / scene / f"{scene}_{kind}" / "test.ann").read_text() == f"{scene}_{kind}.zip"
+
+    # Archives that are already extracted are not submitted again
+    submitted.clear()
+    with ThreadPoolExecutor() as unzip_pool:
+        monkeypatch.setattr(unzip_pool, "submit", lambda fn, path: submitted.append(path))
+        _download_all(scene_map, processor, unzip_executor=unzip_pool)
+    assert submitted == []
+
+def test_download_all_reports_failed_extractions(tmp_path, monkeypatch):
+    """Tests that scenes whose archives fail to extract, or whose worker died, are reported."""
+    from concurrent.futures import Future, ThreadPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    from types import SimpleNamespace
+    from uavsar.core import UavsarDownloader
+
+    def download_product(products, progress=None, keep_zip=True):
+        product_dir = tmp_path / products[0].properties['sceneName']
+        product_dir.mkdir(exist_ok=True)
+        (product_dir / f"{product_dir.name}.zip").write_bytes(b"not a zip")
+        return product_dir, product_dir.name
+
+    processor = UavsarDownloader(work_dir=tmp_path, skip_auth=True)
+    monkeypatch.setattr(processor, "download_product", download_product)
+    scene_map = {
+        scene: [SimpleNamespace(properties={'sceneName': scene, 'url': f"https://example.com/{scene}.zip"})]
+        for scene in ["scene_corrupt", "scene_broken"]
+    }
+
+    def broken_future():
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    with ThreadPoolExecutor() as unzip_pool:
+        submit = unzip_pool.submit
+        monkeypatch.setattr(
+            unzip_pool, "submit",
+            lambda fn, path: broken_future() if path.stem == "scene_broken" else submit(fn, path),
+        )
+        assert sorted(_download_all(scene_map, processor, unzip_executor=unzip_pool)) == ["scene_broken", "scene_corrupt"]
+
+def test_stack_all_tiffs_does_not_import_questionary(tmp_path):
+    """Tests that a fully specified `stack` runs without loading the prompt library."""
+    import subprocess
+    import sys
+
+    data_dir = tmp_path / "product" / "data_grd"
+    data_dir.mkdir(parents=True)
+    script = (
+        "import sys; from typer.testing import CliRunner; from uavsar.cli import app; "
+        f"result = CliRunner().invoke(app, ['stack', '--dir', {str(data_dir)!r}, '--all-tiffs']); "
+        "print(result.exit_code, 'questionary' in sys.modules)"
+    )
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    assert output.split()[-2:] == ["0", "False"]
+
+def _touch_or_fail(product_dir, name, show_progress=True):
+    """Worker for `test_run_in_processes`. Module-level so it can be sent to worker processes."""
+    if name == "bad":
+        raise ValueError("corrupt product")
+    (product_dir / name).write_text(str(show_progress))
+
+def test_threads_per_task():
+    """Tests that tasks running in parallel processes compress on one thread each."""
+    assert _threads_per_task(1, 4) == 'ALL_CPUS'
+    assert _threads_per_task(3, 1) == 'ALL_CPUS'
+    assert _threads_per_task(3, None) == 1
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_run_in_processes(tmp_path, caplog, max_workers):
+    """
+    Tests that a failing directory is logged without stopping the others, inline or in processes,
+    and that workers in processes don't draw their own progress bars.
+    """
+    tasks = {}
+    for name in ["a", "bad", "c"]:
+        (tmp_path / name).mkdir()
+        tasks[tmp_path / name] = (name,)
+
+    _run_in_processes(_touch_or_fail, tasks, max_workers=max_workers)
+
+    assert (tmp_path / "a" / "a").exists() and (tmp_path / "c" / "c").exists()
+    assert (tmp_path / "a" / "a").read_text() == str(max_workers == 1)
+    assert "Failed to process bad: corrupt product" in caplog.text
+
+def test_held_logs(caplog):
+    """Tests that records logged from other threads during a prompt are emitted afterwards, in order."""
+    import logging
+
+    with _held_logs():
+        _in_background(logging.warning, "Fetching date range").result(timeout=5)
+        logging.warning("Date range found")
+        assert caplog.messages == []
+    assert caplog.messages == ["Fetching date range", "Date range found"]
+
+@pytest.mark.parametrize("args, failed_scenes, exit_code", [
+    (["--campaign", "Nowhere"], [], 1),
+    (["--campaign", "Winnipeg, Canada", "--start", "2012-06-01"], [], 1),
+    (["--campaign", "Winnipeg, Canada"], ["scene_b"], 1),
+    (["--campaign", "Winnipeg, Canada"], [], 0),
+])
+def test_search_yes_exit_code(tmp_path, monkeypatch, args, failed_scenes, exit_code):
+    """Tests that a non-interactive search exits non-zero when it can't finish every download."""
+    from types import SimpleNamespace
+    from typer.testing import CliRunner
+    from uavsar import cli, core
+
+    class Processor:
+        def __init__(self, work_dir=None, refresh_auth=False, download_scenes=4):
+            self.base_work_dir = self.work_dir = tmp_path
+
+        def get_available_campaigns(self):
+            return ["Winnipeg, Canada"]
+
+        def set_campaign(self, name):
+            self.work_dir = tmp_path / name
+
+        def get_campaign_date_range(self):
+            return None, None  # The lookup failed
+
+        def search_data(self, start_date, end_date, levels):
+            return [SimpleNamespace(properties={'sceneName': name}) for name in ["scene_a", "scene_b"]]
+
+        def save_auth_cache(self):
+            pass
+
+    monkeypatch.setattr(core, "UavsarDownloader", Processor)
+    monkeypatch.setattr(cli, "_download_all", lambda *args, **kwargs: failed_scenes)
+
+    if exit_code == 0:
+        args = args + ["--start", "2012-06-01", "--end", "2012-07-31"]
+    result = CliRunner().invoke(cli.app, ["search", "--yes", "--level", "GRD_HD", *args])
+    assert result.exit_code == exit_code
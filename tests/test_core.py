@@ -43,8 +43,8 @@ def temp_product_dir(tmp_path, sample_ann_content):
 
     # Create dummy binary data files inside the unzipped data directory
     # (10 rows * 15 cols) * 4 bytes/pixel = 600 bytes
-    (unzipped_data_dir / "test.grd").write_bytes(np.zeros(150, dtype=np.float32).tobytes())
-    (unzipped_data_dir / "test.inc").write_bytes(np.zeros(150, dtype=np.float32).tobytes())
+    np.zeros(150, dtype=np.float32).tofile(unzipped_data_dir / "test.grd")
+    np.zeros(150, dtype=np.float32).tofile(unzipped_data_dir / "test.inc")
 
     return unzipped_data_dir # Return the path to the unzipped data
 
@@ -61,6 +61,66 @@ def test_read_annotation(processor, sample_ann_content, tmp_path):
     assert ann_data['grd_pwr.val_frmt']['value'] == 'REAL*4'
     assert ann_data['grd_pwr.no_data']['value'] == -10000.0
 
+def test_read_annotation_cache(processor, tmp_path, sample_ann_content, monkeypatch):
+    """Tests that parsed annotations are reused until the annotation file changes."""
+    import os
+    ann_path = tmp_path / "test.ann"
+    ann_path.write_text(sample_ann_content)
+
+    parses = []
+    parse = UavsarDownloader._parse_annotation
+    monkeypatch.setattr(UavsarDownloader, "_parse_annotation", staticmethod(lambda f: parses.append(f) or parse(f)))
+
+    first = processor._read_annotation(ann_path)
+    assert processor._read_annotation(ann_path) == first
+    assert len(parses) == 1
+    assert (tmp_path / "test.ann.v2.json").exists()
+
+    # A newer annotation file is parsed again
+    ann_path.write_text(sample_ann_content.replace("= 10", "= 20"))
+    cache_mtime = (tmp_path / "test.ann.v2.json").stat().st_mtime
+    os.utime(ann_path, (cache_mtime + 10, cache_mtime + 10))
+    assert processor._read_annotation(ann_path)['grd_pwr.set_rows']['value'] == 20
+    assert len(parses) == 2
+
+    # Acquisition times come back from the cache as the same timestamps
+    ann_path.write_text("start time of acquisition (&) = 20-JUN-2012 16:30:00 UTC\n")
+    os.utime(ann_path, (cache_mtime - 10, cache_mtime - 10))
+    os.utime(tmp_path / "test.ann.v2.json", (cache_mtime - 20, cache_mtime - 20))
+    first = processor._read_annotation(ann_path)
+    cached = processor._read_annotation(ann_path)
+    assert len(parses) == 3
+    assert cached == first
+    assert cached['start time of acquisition']['value'].tzinfo.zone == 'US/Mountain'
+
+def test_index_annotation(processor, sample_ann_content, tmp_path):
+    """Tests that annotation fields are indexed by the layer prefixes that define them."""
+    from uavsar.core import _index_annotation
+    ann_path = tmp_path / "test.ann"
+    ann_path.write_text(sample_ann_content)
+
+    index = _index_annotation(processor._read_annotation(ann_path))
+    assert index['set_rows'] == {'grd_pwr', 'inc'}
+    assert index['row_addr'] == {'grd_pwr'}
+    assert 'upper_left_easting' not in index
+
+def test_read_annotation_line_formats(processor, tmp_path):
+    """Tests that units, comments and values with spaces are parsed, and comment lines are skipped."""
+    ann_path = tmp_path / "test.ann"
+    ann_path.write_text(
+        "; Comment-only line = not a key\n"
+        "\n"
+        "Site Description                 = Winnipeg, Canada ; Site of the flight\n"
+        "  grd_pwr.set_rows   (pixels)    =   10   ;  Rows In Image  \n"
+        "peg_point_utm_zone (&) = 14\n"
+    )
+    ann_data = processor._read_annotation(ann_path)
+
+    assert set(ann_data) == {'site description', 'grd_pwr.set_rows', 'peg_point_utm_zone'}
+    assert ann_data['site description'] == {'value': 'Winnipeg, Canada', 'units': None, 'comment': 'site of the flight'}
+    assert ann_data['grd_pwr.set_rows'] == {'value': 10, 'units': 'pixels', 'comment': 'rows in image'}
+    assert ann_data['peg_point_utm_zone'] == {'value': 14, 'units': '&', 'comment': ''}
+
 def test_convert_file_to_geotiff(processor, temp_product_dir):
     """Tests the conversion of a single binary file to a GeoTIFF."""
     ann_path = temp_product_dir / "test.ann"
@@ -82,6 +142,86 @@ def test_convert_file_to_geotiff(processor, temp_product_dir):
         assert src.nodata == -10000.0
         assert src.transform.a == 5.556e-05  # Pixel width
         assert src.transform.e == -5.556e-05 # Pixel height
+        # Tiled and compressed, so stacking can read it back block by block
+        assert src.profile['tiled']
+        assert src.block_shapes[0] == (512, 512)
+        assert src.compression == rasterio.enums.Compression.zstd
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_convert_cross_pol_to_magnitude(processor, temp_product_dir, monkeypatch, use_numba):
+    """Tests that complex cross-pol GRDs are written as their magnitude."""
+    from uavsar import core
+    if not use_numba:
+        monkeypatch.setattr(core, "_cmag_kernel", lambda: None)
+    elif core._cmag_kernel() is None:
+        pytest.skip("numba is not installed")
+
+    # Convert 40 rows in blocks of 16, so the block buffer is reused and the last block is partial.
+    monkeypatch.setattr(core, "CONVERT_BLOCK_SIZE", 16)
+    ann_data = processor._read_annotation(temp_product_dir / "test.ann")
+    ann_data['grd_pwr.set_rows']['value'] = 40
+    grd_path = temp_product_dir / "test_L090HHHV_CX_01.grd"
+    data = (np.random.rand(40, 15) + 1j * np.random.rand(40, 15)).astype(np.complex64)
+    data.tofile(grd_path)
+
+    processor._convert_file_to_geotiff(grd_path, ann_data)
+
+    with rasterio.open(temp_product_dir / "test_L090HHHV_CX_01.grd.tiff") as src:
+        assert src.dtypes[0] == 'float32'
+        assert np.allclose(src.read(1), np.abs(data))
+
+@pytest.mark.parametrize("val_frmt, val_endi, dtype", [
+    ("REAL*8", None, '<f8'),
+    ("REAL*4", "BIG ENDIAN", '>f4'),
+    ("INTEGER*2", "LITTLE ENDIAN", '<i2'),
+    ("BYTE", None, 'u1'),
+])
+def test_convert_value_formats(processor, temp_product_dir, val_frmt, val_endi, dtype):
+    """Tests that the annotation's value format and byte order decide how the binary is read."""
+    ann_data = processor._read_annotation(temp_product_dir / "test.ann")
+    ann_data['grd_pwr.val_frmt']['value'] = val_frmt
+    if val_endi:
+        ann_data['grd_pwr.val_endi'] = {'value': val_endi, 'units': '&', 'comment': ''}
+    grd_path = temp_product_dir / "test.grd"
+    data = np.arange(150).reshape(10, 15).astype(dtype)
+    data.tofile(grd_path)
+
+    processor._convert_file_to_geotiff(grd_path, ann_data)
+
+    with rasterio.open(temp_product_dir / "test.grd.tiff") as src:
+        assert src.dtypes[0] == np.dtype(dtype).newbyteorder('=').name
+        assert np.array_equal(src.read(1), data)
+        # The annotated -10000.0 doesn't fit an 8-bit raster, so it has no nodata value
+        assert src.nodata == (None if dtype == 'u1' else -10000.0)
+
+def test_read_band_array(processor, temp_product_dir):
+    """Tests that a band is memory-mapped with its annotated shape, and bad sizes are rejected."""
+    ann_data = processor._read_annotation(temp_product_dir / "test.ann")
+    data = np.random.rand(10, 15).astype(np.float32)
+    data.tofile(temp_product_dir / "test.grd")
+
+    arr = processor.read_band_array(temp_product_dir / "test.grd", ann_data)
+    assert isinstance(arr, np.memmap)
+    assert np.array_equal(arr, data)
+    del arr
+
+    (temp_product_dir / "test.grd").write_bytes(b"short")
+    with pytest.raises(ValueError):
+        processor.read_band_array(temp_product_dir / "test.grd", ann_data)
+
+def test_convert_failure_leaves_no_output(processor, temp_product_dir, monkeypatch):
+    """Tests that a conversion failing part way leaves no GeoTIFF behind to be skipped later."""
+    from uavsar import core
+
+    def read_blocks(*args):
+        yield 0, np.zeros((5, 15), dtype=np.float32)
+        raise IOError("disk error")
+
+    monkeypatch.setattr(core, "_read_blocks", read_blocks)
+    ann_data = processor._read_annotation(temp_product_dir / "test.ann")
+    with pytest.raises(IOError):
+        processor._convert_file_to_geotiff(temp_product_dir / "test.grd", ann_data)
+    assert sorted(p.name for p in temp_product_dir.glob("test.grd.*")) == []
 
 def test_convert_ancillary_file_with_fallback(processor, temp_product_dir):
     """
@@ -115,18 +255,48 @@ def stacked_tiffs_dir(temp_product_dir):
 
     # Create a few dummy files to convert
     grd_path = temp_product_dir / "winnip_HHHH.grd"
-    grd_path.write_bytes(np.ones(150, dtype=np.float32).tobytes())
+    np.ones(150, dtype=np.float32).tofile(grd_path)
     
     inc_path = temp_product_dir / "winnip.inc"
-    inc_path.write_bytes(np.full(150, 0.5, dtype=np.float32).tobytes())
+    np.full(150, 0.5, dtype=np.float32).tofile(inc_path)
 
     processor._convert_file_to_geotiff(grd_path, ann_data)
     processor._convert_file_to_geotiff(inc_path, ann_data)
 
     return temp_product_dir
 
-def test_stack_bands(processor, stacked_tiffs_dir):
-    """Tests stacking multiple GeoTIFFs into a single file."""
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_process_product_directory(processor, temp_product_dir, monkeypatch, max_workers):
+    """Tests that every convertible file in a directory is converted once, serially or in worker processes."""
+    processor.process_product_directory(temp_product_dir, max_workers=max_workers)
+
+    for name in ["test.grd.tiff", "test.inc.tiff"]:
+        with rasterio.open(temp_product_dir / name) as src:
+            assert (src.height, src.width) == (10, 15)
+
+    # Files that are already converted are not converted again
+    def fail(*args, **kwargs):
+        raise AssertionError("converted again")
+    monkeypatch.setattr(UavsarDownloader, "_convert_file_to_geotiff", staticmethod(fail))
+    processor.process_product_directory(temp_product_dir, max_workers=1)
+
+def test_process_product_directory_continues_after_failure(processor, temp_product_dir, monkeypatch, caplog):
+    """Tests that a file failing inline is logged and the remaining files are still converted."""
+    convert = UavsarDownloader._convert_file_to_geotiff
+    def convert_or_fail(in_fp, *args, **kwargs):
+        if in_fp.suffix == '.grd':
+            raise ValueError("bad file")
+        return convert(in_fp, *args, **kwargs)
+    monkeypatch.setattr(UavsarDownloader, "_convert_file_to_geotiff", staticmethod(convert_or_fail))
+
+    processor.process_product_directory(temp_product_dir, max_workers=1)
+
+    assert "Failed to convert test.grd: bad file" in caplog.text
+    assert (temp_product_dir / "test.inc.tiff").exists()
+
+@pytest.mark.parametrize("vrt", [False, True])
+def test_stack_bands(processor, stacked_tiffs_dir, vrt):
+    """Tests stacking multiple GeoTIFFs into a single file, or into a virtual stack."""
     # stacked_tiffs_dir is the unzipped data directory. Its parent is the main product directory.
     main_product_dir = stacked_tiffs_dir.parent 
     
@@ -136,10 +306,10 @@ def test_stack_bands(processor, stacked_tiffs_dir):
     ]
 
     # The first argument to stack_bands is the unzipped data directory
-    processor.stack_bands(stacked_tiffs_dir, tiff_paths)
+    processor.stack_bands(stacked_tiffs_dir, tiff_paths, vrt=vrt)
 
     # The output file should be in the parent directory
-    out_stack_path = main_product_dir / f"{main_product_dir.name}_stack.tif"
+    out_stack_path = main_product_dir / f"{main_product_dir.name}_stack.{'vrt' if vrt else 'tif'}"
     assert out_stack_path.exists()
 
     with rasterio.open(out_stack_path) as src:
@@ -147,9 +317,290 @@ def test_stack_bands(processor, stacked_tiffs_dir):
         assert src.height == 10
         assert src.width == 15
         assert src.descriptions == ("winnip_HHHH.grd", "winnip.inc")
+        assert src.nodata == -10000.0
 
         # Check content of the bands
         band1_data = src.read(1)
         band2_data = src.read(2)
         assert np.all(band1_data == 1.0)
-        assert np.all(band2_data == 0.5)
\ No newline at end of file
+        assert np.all(band2_data == 0.5)
+
+def test_stack_bands_by_window(processor, tmp_path):
+    """Tests that bands larger than one block are stacked window by window, and mismatched bands abort."""
+    data_dir = tmp_path / "product" / "data_grd"
+    data_dir.mkdir(parents=True)
+    profile = {
+        'driver': 'GTiff', 'height': 700, 'width': 1100, 'count': 1, 'dtype': 'float32',
+        'crs': 'EPSG:4326', 'transform': rasterio.transform.Affine(0.001, 0, -100, 0, -0.001, 50),
+    }
+    bands = [np.random.rand(700, 1100).astype(np.float32) for _ in range(3)]
+    tiff_paths = []
+    for i, band in enumerate(bands):
+        tiff_paths.append(data_dir / f"band{i}.tiff")
+        with rasterio.open(tiff_paths[-1], 'w', **profile) as dst:
+            dst.write(band, 1)
+
+    processor.stack_bands(data_dir, tiff_paths)
+
+    with rasterio.open(tmp_path / "product" / "product_stack.tif") as src:
+        assert src.count == 3
+        assert src.block_shapes[0] == (512, 512)
+        assert src.compression == rasterio.enums.Compression.zstd
+        assert np.array_equal(src.read(), np.stack(bands))
+
+    # A band with different dimensions aborts before anything is written
+    profile.update(height=10, width=10)
+    with rasterio.open(data_dir / "small.tiff", 'w', **profile) as dst:
+        dst.write(np.zeros((10, 10), dtype=np.float32), 1)
+    (tmp_path / "product" / "product_stack.tif").unlink()
+    processor.stack_bands(data_dir, [tiff_paths[0], data_dir / "small.tiff"])
+    assert not (tmp_path / "product" / "product_stack.tif").exists()
+
+def test_stack_bands_quantized(processor, tmp_path):
+    """Tests that a quantized stack scales each band between its percentiles and keeps nodata at 0."""
+    data_dir = tmp_path / "product" / "data_grd"
+    data_dir.mkdir(parents=True)
+    profile = {
+        'driver': 'GTiff', 'height': 64, 'width': 64, 'count': 1, 'dtype': 'float32', 'nodata': -10000.0,
+        'crs': 'EPSG:4326', 'transform': rasterio.transform.Affine(0.001, 0, -100, 0, -0.001, 50),
+    }
+    band = np.tile(np.linspace(0, 100, 64, dtype=np.float32), (64, 1))
+    band[0, 0] = -10000.0
+    with rasterio.open(data_dir / "band.tiff", 'w', **profile) as dst:
+        dst.write(band, 1)
+
+    processor.stack_bands(data_dir, [data_dir / "band.tiff"], quantize=True)
+
+    with rasterio.open(tmp_path / "product" / "product_stack_uint8.tif") as src:
+        assert src.dtypes[0] == 'uint8'
+        assert src.nodata == 0
+        out = src.read(1)
+    assert out[0, 0] == 0
+    # Values below the 2nd and above the 98th percentile are clipped, the rest scale linearly
+    assert out[1, 0] == 1 and out[1, -1] == 255
+    assert np.all(np.diff(out[1].astype(int)) >= 0)
+
+    with pytest.raises(ValueError):
+        processor.stack_bands(data_dir, [data_dir / "band.tiff"], vrt=True, quantize=True)
+
+def test_quantize_to_uint8_masks_before_casting():
+    """Tests that NaN, inf and nodata pixels become 0 without casting them to uint8."""
+    import warnings
+    from uavsar.core import _quantize_to_uint8
+    block = np.array([[np.nan, np.inf, -np.inf, -10000.0, 0.0, 50.0, 100.0, 200.0]], dtype=np.float32)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        out = _quantize_to_uint8(block, 0.0, 100.0, nodata=-10000.0)
+    assert out.tolist() == [[0, 0, 0, 0, 1, 128, 255, 255]]
+
+@pytest.mark.parametrize("use_isal", [True, False])
+def test_unzip_files(processor, tmp_path, monkeypatch, use_isal):
+    """Tests that archives are extracted into a directory named after each zip file."""
+    import zipfile
+    from uavsar import core
+
+    zip_paths = []
+    for name in ["scene_a_grd", "scene_b_grd"]:
+        zip_path = tmp_path / f"{name}.zip"
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("test.ann", "grd_pwr.set_rows (pixels) = 10\n")
+            zf.writestr("test.grd", np.ones(150, dtype=np.float32).tobytes())
+            zf.writestr("test.inc", np.zeros(150, dtype=np.float32).tobytes())
+            zf.writestr("nested/test.hgt", np.full(150, 2.0, dtype=np.float32).tobytes())
+        zip_paths.append(zip_path)
+
+    if use_isal:
+        processor.unzip_files(zip_paths, max_workers=2)
+    else:
+        # Worker processes start fresh and don't see monkeypatching, so extract in-process
+        monkeypatch.setattr(core, "isal_zlib", None)
+        assert [core._unzip_one(zip_path) for zip_path in zip_paths] == [(zip_path, None) for zip_path in zip_paths]
+
+    for zip_path in zip_paths:
+        extract_dir = tmp_path / zip_path.stem
+        assert (extract_dir / "test.ann").exists()
+        assert (extract_dir / "test.inc").exists()
+        assert np.all(np.fromfile(extract_dir / "nested/test.hgt", dtype=np.float32) == 2.0)
+        grd_data = np.fromfile(extract_dir / "test.grd", dtype=np.float32)
+        assert np.all(grd_data == 1.0)
+
+@pytest.mark.parametrize("use_isal", [True, False])
+def test_unzip_keeps_members_inside_extract_dir(tmp_path, monkeypatch, use_isal):
+    """Tests that members with '..' or absolute paths are extracted inside the target directory."""
+    import zipfile
+    from uavsar import core
+
+    if not use_isal:
+        monkeypatch.setattr(core, "isal_zlib", None)
+
+    zip_path = tmp_path / "archive" / "scene_grd.zip"
+    zip_path.parent.mkdir()
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name in ["test.ann", "../escape/test.grd", "/abs/test.inc", "nested/test.hgt"]:
+            zf.writestr(name, name)
+
+    assert core._unzip_one(zip_path) == (zip_path, None)
+
+    extract_dir = zip_path.parent / "scene_grd"
+    assert not (tmp_path / "escape").exists() and not Path("/abs").exists()
+    assert (extract_dir / "escape" / "test.grd").read_text() == "../escape/test.grd"
+    assert (extract_dir / "abs" / "test.inc").read_text() == "/abs/test.inc"
+    assert core._already_extracted(zip_path)
+
+def test_auth_cache_round_trip(processor, tmp_path, monkeypatch):
+    """Tests that unexpired login cookies are saved privately and restored into a new session."""
+    import os
+    import time
+    import requests
+    from uavsar import core
+
+    cache_file = tmp_path / "auth_cookies.json"
+    monkeypatch.setattr(core, "AUTH_CACHE_FILE", cache_file)
+
+    processor.session = requests.Session()
+    processor.session.cookies.set("asf-urs", "abc", domain=".asf.alaska.edu", expires=int(time.time()) + 3600)
+    processor.session.cookies.set("urs_user_already_logged", "yes", domain="urs.earthdata.nasa.gov", expires=1)
+    processor.session.cookies.set("session_only", "tmp", domain=".asf.alaska.edu")
+    processor.save_auth_cache()
+    assert os.stat(cache_file).st_mode & 0o777 == 0o600
+
+    processor.session = requests.Session()
+    processor._load_auth_cache()
+    assert processor.session.cookies.get_dict() == {"asf-urs": "abc"}
+
+def test_unzip_files_skips_extracted_archives(processor, tmp_path):
+    """Tests that fully extracted archives are skipped unless extraction is forced."""
+    import zipfile
+
+    zip_path = tmp_path / "scene_grd.zip"
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("test.grd", np.ones(150, dtype=np.float32).tobytes())
+    processor.unzip_files([zip_path])
+
+    # Modify the extracted file without changing its size
+    grd_path = tmp_path / "scene_grd" / "test.grd"
+    np.zeros(150, dtype=np.float32).tofile(grd_path)
+    processor.unzip_files([zip_path])
+    assert np.all(np.fromfile(grd_path, dtype=np.float32) == 0.0)
+
+    processor.unzip_files([zip_path], force=True)
+    assert np.all(np.fromfile(grd_path, dtype=np.float32) == 1.0)
+
+    # A truncated file means the previous extraction didn't finish
+    grd_path.write_bytes(b"")
+    processor.unzip_files([zip_path])
+    grd_data = np.fromfile(grd_path, dtype=np.float32)
+    assert grd_data.size == 150 and np.all(grd_data == 1.0)
+
+def test_download_product(tmp_path):
+    """Tests that a scene's files are downloaded concurrently and failures are skipped."""
+    from types import SimpleNamespace
+
+    class Response:
+        def __init__(self, data):
+            self.data = data
+            self.headers = {'content-length': str(len(data))}
+
+        def raise_for_status(self):
+            if self.data is None:
+                raise IOError("404 Not Found")
+
+        def iter_content(self, chunk_size):
+            for i in range(0, len(self.data), chunk_size):
+                yield self.data[i:i + chunk_size]
+
+    files = {
+        "https://example.com/scene_grd.zip": b"g" * 20000,
+        "https://example.com/scene_inc.zip": b"i" * 100,
+        "https://example.com/scene_missing.zip": None,
+    }
+    processor = UavsarDownloader(work_dir=tmp_path, skip_auth=True)
+    processor.session = SimpleNamespace(get=lambda url, **kwargs: Response(files[url]))
+    products = [SimpleNamespace(properties={'sceneName': 'scene', 'url': url}) for url in files]
+
+    product_dir, base_name = processor.download_product(products)
+
+    assert base_name == "scene"
+    assert (product_dir / "scene_grd.zip").read_bytes() == files["https://example.com/scene_grd.zip"]
+    assert (product_dir / "scene_inc.zip").read_bytes() == files["https://example.com/scene_inc.zip"]
+    assert not (product_dir / "scene_missing.zip").exists()
+
+@pytest.mark.parametrize("spool_max_size", [1000, 1 << 26])
+def test_download_product_without_keeping_zip(tmp_path, monkeypatch, spool_max_size):
+    """Tests that archives are extracted as they download and never saved, from memory or disk."""
+    import io
+    import zipfile
+    from types import SimpleNamespace
+    from uavsar import core
+
+    payload = "ok" * 50000
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("scene.ann", payload)
+        zf.writestr("sub/scene.grd", payload)
+        zf.writestr("scene.inc", "x")
+    data = buf.getvalue()
+
+    class Response:
+        headers = {'content-length': str(len(data))}
+        def raise_for_status(self): pass
+        def iter_content(self, chunk_size):
+            for i in range(0, len(data), chunk_size):
+                yield data[i:i + chunk_size]
+
+    # The archive is larger than 1000 bytes, so that case goes through a temporary file
+    monkeypatch.setattr(core, 'SPOOL_MAX_SIZE', spool_max_size)
+    processor = UavsarDownloader(work_dir=tmp_path, skip_auth=True)
+    processor.session = SimpleNamespace(get=lambda url, **kwargs: Response())
+    products = [SimpleNamespace(properties={'sceneName': 'scene', 'url': "https://example.com/scene_grd.zip"})]
+
+    product_dir, _ = processor.download_product(products, keep_zip=False)
+
+    assert sorted(p.name for p in product_dir.iterdir()) == ["scene_grd"]
+    assert (product_dir / "scene_grd" / "sub" / "scene.grd").read_text() == payload
+    assert (product_dir / "scene_grd" / "scene.inc").read_text() == "x"
+
+    # An existing extract directory means the archive is not fetched again.
+    processor.session = None
+    assert processor.download_product(products, keep_zip=False)[0] == product_dir
+
+def test_disk_cache(tmp_path, monkeypatch):
+    """Tests that campaign lookups are cached per campaign until they expire or caching is disabled."""
+    import os
+    from types import SimpleNamespace
+    from uavsar import core
+
+    calls = []
+    def search(**kwargs):
+        calls.append(kwargs['campaign'])
+        return [SimpleNamespace(properties={'startTime': '2012-06-05T10:00:00Z', 'stopTime': '2012-07-17T11:00:00Z'})]
+
+    monkeypatch.setattr(core.asf_search, 'search', search)
+    processor = UavsarDownloader(work_dir=tmp_path, skip_auth=True)
+    processor.set_campaign("Winnipeg, Canada")
+
+    assert processor.get_campaign_date_range() == ('2012-06-05', '2012-07-17')
+    assert processor.get_campaign_date_range() == ('2012-06-05', '2012-07-17')
+    assert calls == ["Winnipeg, Canada"]
+
+    processor.set_campaign("Other")
+    processor.get_campaign_date_range()
+    assert calls == ["Winnipeg, Canada", "Other"]
+
+    # Expired entries and disabled caching fetch again
+    cache_file = tmp_path / '.cache' / 'campaign_date_range_Other.json'
+    os.utime(cache_file, (0, 0))
+    processor.get_campaign_date_range()
+    processor.use_cache = False
+    processor.get_campaign_date_range()
+    assert calls == ["Winnipeg, Canada", "Other", "Other", "Other"]
+
+def test_disk_cache_skips_failed_lookups(tmp_path, monkeypatch):
+    """Tests that a failed (empty) lookup is not written to the cache."""
+    from uavsar import core
+
+    monkeypatch.setattr(core.asf_search, 'campaigns', lambda **kwargs: [])
+    processor = UavsarDownloader(work_dir=tmp_path, skip_auth=True)
+
+    assert processor.get_available_campaigns() == []
+    assert not (tmp_path / '.cache' / 'available_campaigns.json').exists()